@@ -0,0 +1,84 @@
+# data/availability.py
+
+from typing import Callable, Dict, List, Optional
+
+from data.seat_states import SEAT_FREE
+
+# -------------------------
+# Per-event availability summary
+# -------------------------
+# Free seat count per price tier and the cheapest free price, kept current
+# from SeatBlock state changes (reserve / release / hold), so listings read
+# precomputed numbers instead of scanning the seats. Subscribers are called
+# as callback(summary) after every change; they run inside the booking
+# (under the event lock) and should only record or enqueue the update.
+class AvailabilitySummary:
+    def __init__(self, event_id: str, block):
+        self.event_id = event_id
+        self.block = block
+        self.free_by_price: Dict[float, int] = {}
+        self.total_by_price: Dict[float, int] = {}
+        self.min_price: Optional[float] = None
+        self.version = 0      # bumped on every change
+        self.subscribers: List[Callable[["AvailabilitySummary"], None]] = []
+        for price, state in zip(block.prices, block.reserved):
+            self._count(price, state == SEAT_FREE)
+        block.watchers.append(self.on_change)
+
+    def detach(self):
+        self.block.watchers.remove(self.on_change)
+
+    def _count(self, price: float, free: bool):
+        self.total_by_price[price] = self.total_by_price.get(price, 0) + 1
+        self.free_by_price[price] = self.free_by_price.get(price, 0) + free
+        if free and (self.min_price is None or price < self.min_price):
+            self.min_price = price
+
+    @property
+    def available(self) -> int:
+        return self.block.available_count
+
+    @property
+    def total(self) -> int:
+        return len(self.block)
+
+    def subscribe(self, callback: Callable[["AvailabilitySummary"], None]):
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[["AvailabilitySummary"], None]):
+        self.subscribers.remove(callback)
+
+    def on_append(self, pos: int):
+        # a seat was added to the block
+        self._count(self.block.prices[pos], self.block.reserved[pos] == SEAT_FREE)
+        self._notify()
+
+    def on_change(self, pos: int, old: int, new: int):
+        if (old == SEAT_FREE) == (new == SEAT_FREE):
+            return
+        price = self.block.prices[pos]
+        if new == SEAT_FREE:
+            self.free_by_price[price] += 1
+            if self.min_price is None or price < self.min_price:
+                self.min_price = price
+        else:
+            self.free_by_price[price] -= 1
+            if price == self.min_price and not self.free_by_price[price]:
+                self.min_price = min((p for p, n in self.free_by_price.items() if n), default=None)
+        self._notify()
+
+    def _notify(self):
+        self.version += 1
+        for callback in self.subscribers:
+            callback(self)
+
+    def as_dict(self) -> dict:
+        return {
+            "event_id": self.event_id,
+            "total": self.total,
+            "available": self.available,
+            "min_price": self.min_price,
+            "tiers": [{"price": p, "available": self.free_by_price[p], "total": n}
+                      for p, n in sorted(self.total_by_price.items())],
+            "version": self.version,
+        }
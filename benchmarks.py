@@ -0,0 +1,308 @@
+# Benchmark suite for BookingManager and storage hot paths.
+#
+# Builds a synthetic dataset (N events x M seats, K customers, T tickets),
+# times the booking operations and the save/load functions, and reports
+# throughput, latency percentiles and peak traced memory. Results can be
+# written as JSON and compared against an earlier run:
+#
+#   python benchmarks.py --events 20 --seats 5000 --json results.json
+#   python benchmarks.py --json new.json --compare results.json
+
+import argparse
+import filecmp
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from data.booking_system import BookingManager, Seat
+from data.sharding import ShardedBookingManager
+from data import storage
+
+
+def generate_data(num_events: int, num_seats: int, num_customers: int, num_tickets: int,
+                  seed: int = 1) -> BookingManager:
+    rnd = random.Random(seed)
+    manager = BookingManager()
+    per_row = 50
+    for e in range(num_events):
+        seats = [Seat(seat_id=f"R{i // per_row + 1}-{i % per_row + 1}",
+                      row=f"R{i // per_row + 1}",
+                      number=i % per_row + 1,
+                      price=float(20 + 10 * ((i // per_row) % 5)))
+                 for i in range(num_seats)]
+        manager.add_event(f"Event {e}", f"2025-{e % 12 + 1:02d}-15", f"Venue {e % 7}", seats)
+    customer_ids = [manager.register_customer(f"Customer {c}", f"c{c}@example.com").customer_id
+                    for c in range(num_customers)]
+
+    events = list(manager.events.values())
+    num_tickets = min(num_tickets, num_events * num_seats)
+    booked = 0
+    while booked < num_tickets:
+        evt = rnd.choice(events)
+        seat = evt.seats[rnd.randrange(len(evt.seats))]
+        if seat.is_reserved:
+            continue
+        manager.book_seat(evt.event_id, seat.seat_id, rnd.choice(customer_ids))
+        booked += 1
+    return manager
+
+
+def percentile(sorted_values, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def summarize(name: str, latencies, **extra) -> dict:
+    lat = sorted(latencies)
+    total = sum(lat)
+    result = {
+        "name": name,
+        "ops": len(lat),
+        "total_s": total,
+        "ops_per_s": len(lat) / total if total else 0.0,
+        "p50_us": percentile(lat, 0.50) * 1e6,
+        "p95_us": percentile(lat, 0.95) * 1e6,
+        "p99_us": percentile(lat, 0.99) * 1e6,
+        "max_us": (lat[-1] if lat else 0.0) * 1e6,
+    }
+    result.update(extra)
+    return result
+
+
+def time_calls(fn, args_list):
+    latencies = []
+    clock = time.perf_counter
+    for args in args_list:
+        start = clock()
+        fn(*args)
+        latencies.append(clock() - start)
+    return latencies
+
+
+def peak_memory(fn) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+# -------------------------
+# Benchmarks
+# -------------------------
+def bench_booking(manager: BookingManager, ops: int, rnd: random.Random):
+    events = list(manager.events.values())
+    customer_ids = list(manager.customers)
+    requests = []
+    chosen = set()
+    attempts = 0
+    while len(requests) < ops and attempts < ops * 20:
+        attempts += 1
+        evt = rnd.choice(events)
+        pos = rnd.randrange(len(evt.seats))
+        seat = evt.seats[pos]
+        if seat.is_reserved or (evt.event_id, pos) in chosen:
+            continue
+        chosen.add((evt.event_id, pos))
+        requests.append((evt.event_id, seat.seat_id, rnd.choice(customer_ids)))
+
+    tickets = []
+
+    def book(event_id, seat_id, customer_id):
+        tickets.append(manager.book_seat(event_id, seat_id, customer_id).ticket_id)
+
+    results = [summarize("book_seat", time_calls(book, requests))]
+    results.append(summarize("cancel_ticket", time_calls(manager.cancel_ticket, [(t,) for t in tickets])))
+    return results
+
+
+def bench_queries(manager: BookingManager, ops: int, rnd: random.Random):
+    customer_ids = list(manager.customers)
+    event_ids = list(manager.events)
+    results = [
+        summarize("list_tickets_for_customer",
+                  time_calls(manager.list_tickets_for_customer,
+                             [(rnd.choice(customer_ids),) for _ in range(ops)])),
+    ]
+    lookups = max(1, ops // 100)
+    events = [manager.events[rnd.choice(event_ids)] for _ in range(lookups)]
+    results.append(summarize("Event.get_available_seats",
+                             time_calls(lambda e: e.get_available_seats(), [(e,) for e in events])))
+    results.append(summarize("Event.count_available_seats",
+                             time_calls(lambda e: e.count_available_seats(), [(e,) for e in events])))
+    return results
+
+
+STORAGE_BACKENDS = [
+    ("json", storage.save_to_json, storage.load_from_json, ".json"),
+    ("json_stream", None, storage.load_from_json_stream, ".json"),
+    ("xml", storage.save_to_xml, storage.load_from_xml, ".xml"),
+    ("xml_stream", None, storage.load_from_xml_stream, ".xml"),
+    ("binary", storage.save_to_binary, storage.load_from_binary, ".bin"),
+]
+
+
+def bench_storage(manager: BookingManager, repeat: int, workdir: str):
+    results = []
+    for name, save, load, ext in STORAGE_BACKENDS:
+        filename = os.path.join(workdir, "bench" + ext)
+        if save is not None:
+            lat = time_calls(save, [(manager, filename)] * repeat)
+            peak = peak_memory(lambda: save(manager, filename))
+            results.append(summarize(f"save_{name}", lat, peak_bytes=peak, file_bytes=os.path.getsize(filename)))
+
+        target = BookingManager()
+        lat = time_calls(load, [(target, filename)] * repeat)
+        target = BookingManager()
+        peak = peak_memory(lambda: load(target, filename))
+        results.append(summarize(f"load_{name}", lat, peak_bytes=peak))
+    return results
+
+
+PARALLEL_FORMATS = [
+    ("json", storage.save_to_json, storage.save_to_json_parallel,
+     storage.load_from_json, storage.load_from_json_parallel, ".json"),
+    ("xml", storage.save_to_xml, storage.save_to_xml_parallel,
+     storage.load_from_xml, storage.load_from_xml_parallel, ".xml"),
+]
+
+
+def bench_parallel_storage(manager: BookingManager, repeat: int, workdir: str, workers: int):
+    # sequential vs process-pool export/import; the parallel files must match byte for byte.
+    # The sequential rows are tagged [seq]: bench_storage already reports save_json etc.
+    # on its own data set, and --compare matches rows by name
+    results = []
+    for name, save, save_par, load, load_par, ext in PARALLEL_FORMATS:
+        seq_file = os.path.join(workdir, "seq" + ext)
+        par_file = os.path.join(workdir, "par" + ext)
+        results.append(summarize(f"save_{name}[seq]", time_calls(save, [(manager, seq_file)] * repeat)))
+        results.append(summarize(f"save_{name}_parallel[{workers}]",
+                                 time_calls(save_par, [(manager, par_file, workers)] * repeat)))
+        if not filecmp.cmp(seq_file, par_file, shallow=False):
+            raise SystemExit(f"parallel {name} export differs from the sequential one")
+        results.append(summarize(f"load_{name}[seq]", time_calls(load, [(BookingManager(), seq_file)] * repeat)))
+        results.append(summarize(f"load_{name}_parallel[{workers}]",
+                                 time_calls(load_par, [(BookingManager(), seq_file, workers)] * repeat)))
+    return results
+
+
+def bench_sharded(num_events: int, num_seats: int, num_customers: int, ops: int, shard_counts,
+                  rnd: random.Random, batch: int = 500):
+    # the same on-sale (random seats over all events, booked in batches) against
+    # 1..N worker processes; throughput should grow with the shard count
+    results = []
+    per_row = 50
+    seats = [Seat(f"R{i // per_row + 1}-{i % per_row + 1}", f"R{i // per_row + 1}", i % per_row + 1, 50.0)
+             for i in range(num_seats)]
+    for shards in shard_counts:
+        with ShardedBookingManager(shards) as sharded:
+            event_ids = [sharded.add_event(f"Event {e}", "2025-11-15", "Arena", seats) for e in range(num_events)]
+            customer_ids = [sharded.register_customer(f"Customer {c}", f"c{c}@example.com").customer_id
+                            for c in range(min(num_customers, 200))]
+            requests = [(rnd.choice(event_ids), seats[rnd.randrange(num_seats)].seat_id, rnd.choice(customer_ids))
+                        for _ in range(ops)]
+            batches = [(requests[i:i + batch],) for i in range(0, len(requests), batch)]
+            lat = time_calls(sharded.book_many, batches)
+            r = summarize(f"sharded_book_many[{shards}]", lat, bookings=len(requests))
+            r["bookings_per_s"] = len(requests) / r["total_s"] if r["total_s"] else 0.0
+            results.append(r)
+    return results
+
+
+# -------------------------
+# Reporting
+# -------------------------
+def print_results(results, baseline=None):
+    base = {r["name"]: r for r in baseline["results"]} if baseline else {}
+    header = f"{'benchmark':<30} {'ops':>8} {'ops/s':>12} {'p50 us':>10} {'p95 us':>10} {'p99 us':>10} {'peak MB':>9}"
+    if base:
+        header += f" {'vs base':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        peak = f"{r['peak_bytes'] / 1e6:.1f}" if "peak_bytes" in r else "-"
+        line = (f"{r['name']:<30} {r['ops']:>8} {r['ops_per_s']:>12,.1f} {r['p50_us']:>10.1f} "
+                f"{r['p95_us']:>10.1f} {r['p99_us']:>10.1f} {peak:>9}")
+        old = base.get(r["name"])
+        if old and old["ops_per_s"]:
+            line += f" {r['ops_per_s'] / old['ops_per_s']:>7.2f}x"
+        if "bookings_per_s" in r:
+            line += f"  ({r['bookings_per_s']:,.0f} bookings/s)"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BookingManager and storage benchmarks")
+    parser.add_argument("--events", type=int, default=10)
+    parser.add_argument("--seats", type=int, default=5000)
+    parser.add_argument("--customers", type=int, default=2000)
+    parser.add_argument("--tickets", type=int, default=20000)
+    parser.add_argument("--ops", type=int, default=10000, help="operations per booking/query benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="repetitions per storage benchmark")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--skip-storage", action="store_true")
+    parser.add_argument("--parallel", type=int, default=0, metavar="WORKERS",
+                        help="also compare sequential and process-pool JSON/XML export/import")
+    parser.add_argument("--shards", type=int, default=0,
+                        help="also benchmark multi-process sharded booking with 1..SHARDS workers")
+    parser.add_argument("--json", metavar="PATH", help="write machine-readable results to PATH")
+    parser.add_argument("--compare", metavar="PATH", help="earlier --json output to compare throughput against")
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    start = time.perf_counter()
+    holder = {}
+    gen_peak = peak_memory(lambda: holder.setdefault("m", generate_data(
+        args.events, args.seats, args.customers, args.tickets, args.seed)))
+    manager = holder["m"]
+    print(f"generated {len(manager.events)} events x {args.seats} seats, {len(manager.customers)} customers, "
+          f"{len(manager.tickets)} tickets in {time.perf_counter() - start:.1f}s "
+          f"(peak {gen_peak / 1e6:.1f} MB traced)\n")
+
+    results = []
+    results += bench_booking(manager, args.ops, rnd)
+    results += bench_queries(manager, args.ops, rnd)
+    if not args.skip_storage:
+        with tempfile.TemporaryDirectory() as workdir:
+            results += bench_storage(manager, args.repeat, workdir)
+            if args.parallel:
+                results += bench_parallel_storage(manager, args.repeat, workdir, args.parallel)
+    if args.shards:
+        counts = sorted({1, *(n for n in (2, 4, 8, 16) if n < args.shards), args.shards})
+        results += bench_sharded(args.events, args.seats, args.customers, args.ops * 10, counts, rnd)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    if args.json:
+        report = {
+            "meta": {
+                "timestamp": datetime.utcnow().isoformat(),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "params": vars(args),
+                "dataset_peak_bytes": gen_peak,
+            },
+            "results": results,
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nresults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,188 @@
 # data/booking_system.py
 
-import uuid
+import heapq
+import itertools
+import sys
+import threading
+import time
+from array import array
 from dataclasses import dataclass, field
-from typing import List, Dict
-from datetime import datetime
+from typing import List, Dict, Iterator, Optional, Set, Tuple, Callable, Any
 
 from data.exceptions import SeatUnavailableError, NotFoundError, ValidationError
+from data.ids import SnowflakeIds, utc_isoformat
+from data.seat_states import SEAT_FREE, SEAT_BOOKED, SEAT_HELD
+from data.seat_search import RowRunIndex
+from data.availability import AvailabilitySummary
+from data.snapshots import ManagerSnapshot
 
 # -------------------------
 # Models
 # -------------------------
-@dataclass
+# Seats are stored column-wise per event (SeatBlock): parallel arrays for
+# id/row/number/price plus one state byte per seat. Seat objects are small
+# views (block, position) materialized on demand.
+class SeatBlock:
+    __slots__ = ("ids", "rows", "numbers", "prices", "reserved", "index", "available_count", "watchers")
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.rows: List[str] = []             # interned, so repeated row names share one string
+        self.numbers = array("i")
+        self.prices = array("d")
+        self.reserved = bytearray()           # SEAT_FREE / SEAT_BOOKED / SEAT_HELD
+        self.index: Dict[str, int] = {}       # seat_id -> position (first seat wins on duplicate ids)
+        self.available_count = 0
+        # called as watcher(pos, old_state, new_state) on every state change
+        self.watchers: List[Callable[[int, int, int], None]] = []
+
+    @classmethod
+    def from_columns(cls, ids: List[str], rows: List[str], numbers: array, prices: array,
+                     reserved: bytearray) -> "SeatBlock":
+        block = cls()
+        block.ids = ids
+        block.rows = list(map(sys.intern, rows))
+        block.numbers = numbers
+        block.prices = prices
+        block.reserved = reserved
+        # built back to front so the first seat wins on duplicate ids
+        block.index = dict(zip(reversed(ids), range(len(ids) - 1, -1, -1)))
+        block.available_count = reserved.count(0)
+        return block
+
+    def append(self, seat_id: str, row: str, number: int, price: float, is_reserved: bool = False) -> int:
+        pos = len(self.ids)
+        self.ids.append(seat_id)
+        self.rows.append(sys.intern(row))
+        self.numbers.append(number)
+        self.prices.append(price)
+        self.reserved.append(1 if is_reserved else 0)
+        self.index.setdefault(seat_id, pos)
+        if not is_reserved:
+            self.available_count += 1
+        return pos
+
+    def set_reserved(self, pos: int, value: bool):
+        self.set_state(pos, SEAT_BOOKED if value else SEAT_FREE)
+
+    def set_state(self, pos: int, state: int):
+        old = self.reserved[pos]
+        if old != state:
+            self.reserved[pos] = state
+            if old == SEAT_FREE:
+                self.available_count -= 1
+            elif state == SEAT_FREE:
+                self.available_count += 1
+            for watcher in self.watchers:
+                watcher(pos, old, state)
+
+    def available_positions(self) -> Iterator[int]:
+        find = self.reserved.find
+        pos = find(0)
+        while pos != -1:
+            yield pos
+            pos = find(0, pos + 1)
+
+    def records(self) -> Iterator[Tuple[str, str, int, float, bool]]:
+        # raw (seat_id, row, number, price, is_reserved) tuples, without building Seat views;
+        # holds are not persisted, so held seats come out as free
+        for sid, row, number, price, r in zip(self.ids, self.rows, self.numbers, self.prices, self.reserved):
+            yield sid, row, number, price, r == SEAT_BOOKED
+
+    def persisted_states(self) -> bytearray:
+        # the state column as it should be saved (held seats are written as free)
+        if SEAT_HELD not in self.reserved:
+            return self.reserved
+        return self.reserved.translate(_DROP_HOLDS)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, pos):
+        if isinstance(pos, slice):
+            return [Seat._view(self, i) for i in range(*pos.indices(len(self.ids)))]
+        if pos < 0:
+            pos += len(self.ids)
+        if not 0 <= pos < len(self.ids):
+            raise IndexError("seat index out of range")
+        return Seat._view(self, pos)
+
+    def __iter__(self) -> Iterator["Seat"]:
+        for pos in range(len(self.ids)):
+            yield Seat._view(self, pos)
+
+    def __eq__(self, other):
+        if isinstance(other, SeatBlock):
+            return list(self.records()) == list(other.records())
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
+
+_DROP_HOLDS = bytes(SEAT_FREE if i == SEAT_HELD else i for i in range(256))
+
 class Seat:
-    seat_id: str
-    row: str
-    number: int
-    price: float
-    is_reserved: bool = False
+    __slots__ = ("_block", "_pos")
+
+    def __init__(self, seat_id: str, row: str, number: int, price: float, is_reserved: bool = False):
+        # a detached seat lives in its own one-seat block until it is added to an Event
+        self._block = SeatBlock()
+        self._pos = self._block.append(seat_id, row, number, price, is_reserved)
+
+    @classmethod
+    def _view(cls, block: SeatBlock, pos: int) -> "Seat":
+        seat = cls.__new__(cls)
+        seat._block = block
+        seat._pos = pos
+        return seat
+
+    @property
+    def seat_id(self) -> str:
+        return self._block.ids[self._pos]
+
+    @property
+    def row(self) -> str:
+        return self._block.rows[self._pos]
+
+    @property
+    def number(self) -> int:
+        return self._block.numbers[self._pos]
+
+    @property
+    def price(self) -> float:
+        return self._block.prices[self._pos]
+
+    @property
+    def is_reserved(self) -> bool:
+        # True for booked and for held seats: neither can be sold
+        return bool(self._block.reserved[self._pos])
+
+    @property
+    def is_held(self) -> bool:
+        return self._block.reserved[self._pos] == SEAT_HELD
 
     def reserve(self):
-        if self.is_reserved:
+        if self._block.reserved[self._pos]:
             raise SeatUnavailableError(f"Seat {self.seat_id} is already reserved.")
-        self.is_reserved = True
+        self._block.set_reserved(self._pos, True)
 
     def release(self):
-        self.is_reserved = False
+        self._block.set_reserved(self._pos, False)
+
+    def hold(self):
+        if self._block.reserved[self._pos]:
+            raise SeatUnavailableError(f"Seat {self.seat_id} is already reserved.")
+        self._block.set_state(self._pos, SEAT_HELD)
+
+    def __eq__(self, other):
+        if isinstance(other, Seat):
+            return (self.seat_id, self.row, self.number, self.price, self.is_reserved) == \
+                   (other.seat_id, other.row, other.number, other.price, other.is_reserved)
+        return NotImplemented
+
+    def __repr__(self):
+        return (f"Seat(seat_id={self.seat_id!r}, row={self.row!r}, number={self.number!r}, "
+                f"price={self.price!r}, is_reserved={self.is_reserved!r})")
 
 @dataclass
 class Event:
@@ -32,24 +190,79 @@ class Event:
     name: str
     date: str  # ISO date string
     location: str
-    seats: List[Seat] = field(default_factory=list)
+    # a list of Seat objects is accepted and converted into a SeatBlock
+    seats: SeatBlock = field(default_factory=SeatBlock)
+    # guards seat state of this event; bookings for different events run in parallel
+    lock: threading.RLock = field(default_factory=threading.RLock, init=False, repr=False, compare=False)
+    # per-row free-run index for find_best_seats, built on first use
+    _search: Any = field(default=None, init=False, repr=False, compare=False)
+    # free seats per price tier / min price, built on first use and then kept current
+    _availability: Any = field(default=None, init=False, repr=False, compare=False)
 
-    def get_available_seats(self):
-        return [s for s in self.seats if not s.is_reserved]
+    def __post_init__(self):
+        if not isinstance(self.seats, SeatBlock):
+            seats, self.seats = self.seats, SeatBlock()
+            for s in seats:
+                self.add_seat(s)
+
+    def add_seat(self, seat: Seat):
+        # for an event held by a BookingManager use BookingManager.add_seat, which
+        # also marks the event for the next incremental save
+        pos = self.seats.append(seat.seat_id, seat.row, seat.number, seat.price, seat.is_reserved)
+        # the caller's Seat becomes a view onto this event's block
+        seat._block = self.seats
+        seat._pos = pos
+        if self._search is not None:
+            # rebuilt lazily with the new seat on the next search
+            self._search.detach()
+            self._search = None
+        if self._availability is not None:
+            self._availability.on_append(pos)
+
+    def get_available_seats(self) -> List[Seat]:
+        return [Seat._view(self.seats, pos) for pos in self.seats.available_positions()]
+
+    def count_seats(self) -> int:
+        return len(self.seats)
+
+    def count_available_seats(self) -> int:
+        return self.seats.available_count
+
+    def availability(self) -> AvailabilitySummary:
+        with self.lock:
+            if self._availability is None:
+                self._availability = AvailabilitySummary(self.event_id, self.seats)
+            return self._availability
+
+    def availability_summary(self) -> dict:
+        # consistent point-in-time copy of the summary
+        summary = self.availability()
+        with self.lock:
+            return summary.as_dict()
 
     def find_seat(self, seat_id: str) -> Seat:
-        for s in self.seats:
-            if s.seat_id == seat_id:
-                return s
-        raise NotFoundError(f"Seat {seat_id} not found in event {self.event_id}.")
+        pos = self.seats.index.get(seat_id)
+        if pos is None:
+            raise NotFoundError(f"Seat {seat_id} not found in event {self.event_id}.")
+        return Seat._view(self.seats, pos)
 
-@dataclass
+    def find_best_seats(self, count: int, min_price: float = None, max_price: float = None) -> List[Seat]:
+        # best run of `count` free seats side by side in one row, each priced within
+        # [min_price, max_price]; empty list if there is none
+        if count <= 0:
+            raise ValidationError("Seat count must be positive.")
+        with self.lock:
+            if self._search is None:
+                self._search = RowRunIndex(self.seats)
+            return [Seat._view(self.seats, pos) for pos in self._search.find(count, min_price, max_price)]
+
+@dataclass(slots=True)
 class Customer:
     customer_id: str
     name: str
     email: str
 
-@dataclass
+@dataclass(slots=True)
 class Ticket:
     ticket_id: str
     event_id: str
@@ -58,80 +271,373 @@ class Ticket:
     price: float
     created_at: str
     status: str = "booked"  # or "cancelled"
+    # manager change sequence number when the ticket was added (snapshot visibility)
+    seq: int = field(default=0, repr=False, compare=False)
 
     def cancel(self):
         if self.status == "cancelled":
             raise ValidationError("Ticket already cancelled.")
         self.status = "cancelled"
 
+@dataclass(slots=True)
+class Hold:
+    hold_id: str
+    event_id: str
+    seat_ids: List[str]
+    customer_id: str
+    expires_at: float  # time.monotonic() deadline
+
 # -------------------------
 # Booking Manager
 # -------------------------
 class BookingManager:
-    def __init__(self):
+    def __init__(self, id_generator: Optional[Callable[[], str]] = None):
+        # new event/customer/ticket/hold ids; any callable returning a unique string
+        self.new_id = id_generator or SnowflakeIds()
         self.events: Dict[str, Event] = {}
         self.customers: Dict[str, Customer] = {}
         self.tickets: Dict[str, Ticket] = {}
+        # secondary indexes, kept up to date by add_ticket / cancel_ticket
+        self._tickets_by_customer: Dict[str, List[Ticket]] = {}
+        self._tickets_by_event: Dict[str, List[Ticket]] = {}
+        self._revenue_by_event: Dict[str, float] = {}
+        # used for tickets whose event no longer exists
+        self._orphan_lock = threading.RLock()
+        # change listeners: called as listener(op, obj) after every successful mutation
+        self._listeners: List[Callable[[str, Any], None]] = []
+        # seat holds: hold_id -> Hold, plus a min-heap of (expires_at, hold_id) so
+        # expiry only looks at holds that are due; stale heap entries are skipped
+        self.holds: Dict[str, Hold] = {}
+        self._hold_heap: List[Tuple[float, str]] = []
+        self._hold_lock = threading.Lock()
+        # dirty tracking for incremental saves (storage.save_sharded): ids changed since
+        # the last mark_clean(); _dirty_all means "everything, and drop what is gone"
+        self._dirty_lock = threading.Lock()
+        self._dirty_all = True
+        self._dirty_events: Set[str] = set()
+        self._dirty_customers: Set[str] = set()
+        self._dirty_tickets: Set[str] = set()
+        # change sequence numbers for snapshots: tickets get one when added, and
+        # cancellations are recorded here with theirs
+        self._sequence = itertools.count(1)
+        self._cancel_seq: Dict[str, int] = {}
+
+    def clear(self):
+        self.events.clear()
+        self.customers.clear()
+        self.tickets.clear()
+        self._tickets_by_customer.clear()
+        self._tickets_by_event.clear()
+        self._revenue_by_event.clear()
+        self.holds.clear()
+        self._hold_heap.clear()
+        self._cancel_seq.clear()
+        with self._dirty_lock:
+            self._dirty_all = True
+
+    # -- dirty tracking
+    def take_dirty(self) -> Tuple[bool, Set[str], Set[str], Set[str]]:
+        # returns (all, event_ids, customer_ids, ticket_ids) and starts tracking afresh
+        with self._dirty_lock:
+            dirty = (self._dirty_all, self._dirty_events, self._dirty_customers, self._dirty_tickets)
+            self._dirty_all = False
+            self._dirty_events, self._dirty_customers, self._dirty_tickets = set(), set(), set()
+        return dirty
+
+    def restore_dirty(self, dirty: Tuple[bool, Set[str], Set[str], Set[str]]):
+        # put back what take_dirty() handed out, e.g. after a failed save
+        with self._dirty_lock:
+            self._dirty_all = self._dirty_all or dirty[0]
+            self._dirty_events |= dirty[1]
+            self._dirty_customers |= dirty[2]
+            self._dirty_tickets |= dirty[3]
+
+    def mark_clean(self):
+        self.take_dirty()
+
+    def mark_event_dirty(self, event_id: str):
+        # for changes made to an event outside the manager's own methods
+        with self._dirty_lock:
+            self._dirty_events.add(event_id)
+
+    def _mark_ticket_dirty(self, ticket: Ticket):
+        # a ticket change also changes the seat map of its event
+        with self._dirty_lock:
+            self._dirty_tickets.add(ticket.ticket_id)
+            self._dirty_events.add(ticket.event_id)
+
+    # -- change listeners (journal, persistence, notifications)
+    def add_listener(self, listener: Callable[[str, Any], None]):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str, Any], None]):
+        self._listeners.remove(listener)
+
+    def _emit(self, op: str, obj: Any):
+        for listener in self._listeners:
+            listener(op, obj)
 
     # -- create helpers
     def add_event(self, name: str, date: str, location: str, seats: List[Seat]) -> Event:
-        eid = str(uuid.uuid4())
+        eid = self.new_id()
         evt = Event(event_id=eid, name=name, date=date, location=location, seats=seats)
         self.events[eid] = evt
+        with self._dirty_lock:
+            self._dirty_events.add(eid)
+        if self._listeners:
+            self._emit("add_event", evt)
         return evt
 
+    def add_seat(self, event_id: str, seat: Seat):
+        event = self.events.get(event_id)
+        if event is None:
+            raise NotFoundError("Event not found.")
+        with event.lock:
+            event.add_seat(seat)
+            self.mark_event_dirty(event_id)
+            if self._listeners:
+                self._emit("add_seat", (event_id, seat))
+
     def register_customer(self, name: str, email: str) -> Customer:
-        cid = str(uuid.uuid4())
+        cid = self.new_id()
         cust = Customer(customer_id=cid, name=name, email=email)
         self.customers[cid] = cust
+        with self._dirty_lock:
+            self._dirty_customers.add(cid)
+        if self._listeners:
+            self._emit("register_customer", cust)
         return cust
 
     # -- booking / cancel
     def book_seat(self, event_id: str, seat_id: str, customer_id: str) -> Ticket:
+        self.expire_holds()
         if event_id not in self.events:
             raise NotFoundError("Event not found.")
         if customer_id not in self.customers:
             raise NotFoundError("Customer not found.")
 
         event = self.events[event_id]
-        seat = event.find_seat(seat_id)   # may raise NotFoundError
-        seat.reserve()                    # may raise SeatUnavailableError
-
-        tid = str(uuid.uuid4())
-        created_at = datetime.utcnow().isoformat()
-        ticket = Ticket(ticket_id=tid,
-                        event_id=event_id,
-                        seat_id=seat_id,
-                        customer_id=customer_id,
-                        price=seat.price,
-                        created_at=created_at)
-        self.tickets[tid] = ticket
+        tid = self.new_id()
+        created_at = utc_isoformat()
+        with event.lock:
+            seat = event.find_seat(seat_id)   # may raise NotFoundError
+            seat.reserve()                    # may raise SeatUnavailableError
+            ticket = Ticket(ticket_id=tid,
+                            event_id=event_id,
+                            seat_id=seat_id,
+                            customer_id=customer_id,
+                            price=seat.price,
+                            created_at=created_at)
+            self.add_ticket(ticket)
+            if self._listeners:
+                self._emit("book", [ticket])
         return ticket
 
+    def book_seats(self, event_id: str, seat_ids: List[str], customer_id: str) -> List[Ticket]:
+        return self.book_bulk([(event_id, sid, customer_id) for sid in seat_ids])
+
+    def book_bulk(self, bookings: List[Tuple[str, str, str]]) -> List[Ticket]:
+        # all-or-nothing: either every (event_id, seat_id, customer_id) is booked or none is
+        self.expire_holds()
+        seen = set()
+        for event_id, seat_id, customer_id in bookings:
+            if event_id not in self.events:
+                raise NotFoundError("Event not found.")
+            if customer_id not in self.customers:
+                raise NotFoundError("Customer not found.")
+            if (event_id, seat_id) in seen:
+                raise ValidationError(f"Seat {seat_id} requested twice.")
+            seen.add((event_id, seat_id))
+            self.events[event_id].find_seat(seat_id)   # may raise NotFoundError
+
+        # lock events in a fixed order so concurrent batches cannot deadlock
+        events = [self.events[eid] for eid in sorted({b[0] for b in bookings})]
+        created_at = utc_isoformat()
+        for evt in events:
+            evt.lock.acquire()
+        try:
+            reserved = []
+            try:
+                for event_id, seat_id, _ in bookings:
+                    seat = self.events[event_id].find_seat(seat_id)
+                    seat.reserve()   # may raise SeatUnavailableError
+                    reserved.append(seat)
+            except SeatUnavailableError:
+                for seat in reserved:
+                    seat.release()
+                raise
+
+            tickets = [Ticket(ticket_id=self.new_id(),
+                              event_id=event_id,
+                              seat_id=seat.seat_id,
+                              customer_id=customer_id,
+                              price=seat.price,
+                              created_at=created_at)
+                       for (event_id, _, customer_id), seat in zip(bookings, reserved)]
+            for ticket in tickets:
+                self.add_ticket(ticket)
+            if self._listeners:
+                self._emit("book", tickets)
+        finally:
+            for evt in reversed(events):
+                evt.lock.release()
+        return tickets
+
+    # -- holds: seats kept aside for a checkout, turned into tickets by confirm_hold
+    def hold_seats(self, event_id: str, seat_ids: List[str], customer_id: str, ttl: float = 600.0) -> Hold:
+        self.expire_holds()
+        if event_id not in self.events:
+            raise NotFoundError("Event not found.")
+        if customer_id not in self.customers:
+            raise NotFoundError("Customer not found.")
+        if len(set(seat_ids)) != len(seat_ids):
+            raise ValidationError("Seat requested twice.")
+        if ttl <= 0:
+            raise ValidationError("Hold TTL must be positive.")
+
+        event = self.events[event_id]
+        with event.lock:
+            seats = [event.find_seat(sid) for sid in seat_ids]   # may raise NotFoundError
+            for seat in seats:
+                if seat.is_reserved:
+                    raise SeatUnavailableError(f"Seat {seat.seat_id} is already reserved.")
+            for seat in seats:
+                seat.hold()
+            hold = Hold(hold_id=self.new_id(), event_id=event_id, seat_ids=list(seat_ids),
+                        customer_id=customer_id, expires_at=time.monotonic() + ttl)
+            self.holds[hold.hold_id] = hold
+        with self._hold_lock:
+            heapq.heappush(self._hold_heap, (hold.expires_at, hold.hold_id))
+        return hold
+
+    def confirm_hold(self, hold_id: str) -> List[Ticket]:
+        hold = self.holds.get(hold_id)
+        if hold is None:
+            raise NotFoundError("Hold not found or expired.")
+        event = self.events[hold.event_id]
+        with event.lock:
+            if self.holds.get(hold_id) is not hold:
+                raise NotFoundError("Hold not found or expired.")
+            if hold.expires_at <= time.monotonic():
+                self._drop_hold(hold)
+                raise ValidationError("Hold expired.")
+            del self.holds[hold_id]
+
+            created_at = utc_isoformat()
+            tickets = []
+            for sid in hold.seat_ids:
+                seat = event.find_seat(sid)
+                seat._block.set_state(seat._pos, SEAT_BOOKED)
+                tickets.append(Ticket(ticket_id=self.new_id(),
+                                      event_id=hold.event_id,
+                                      seat_id=sid,
+                                      customer_id=hold.customer_id,
+                                      price=seat.price,
+                                      created_at=created_at))
+            for ticket in tickets:
+                self.add_ticket(ticket)
+            if self._listeners:
+                self._emit("book", tickets)
+        return tickets
+
+    def release_hold(self, hold_id: str):
+        hold = self.holds.get(hold_id)
+        if hold is None:
+            raise NotFoundError("Hold not found or expired.")
+        with self.events[hold.event_id].lock:
+            if self.holds.get(hold_id) is hold:
+                self._drop_hold(hold)
+
+    def expire_holds(self, now: float = None) -> int:
+        # cheap when nothing is due: one unlocked peek at the heap top (another
+        # thread may pop the last entry meanwhile, hence no separate emptiness check)
+        heap = self._hold_heap
+        now = time.monotonic() if now is None else now
+        try:
+            if heap[0][0] > now:
+                return 0
+        except IndexError:
+            return 0
+        due = []
+        with self._hold_lock:
+            while heap and heap[0][0] <= now:
+                due.append(heapq.heappop(heap)[1])
+        expired = 0
+        for hold_id in due:
+            hold = self.holds.get(hold_id)
+            if hold is None:
+                continue   # already confirmed or released
+            event = self.events.get(hold.event_id)
+            with event.lock if event else self._orphan_lock:
+                if self.holds.get(hold_id) is hold:
+                    self._drop_hold(hold)
+                    expired += 1
+        return expired
+
+    def _drop_hold(self, hold: Hold):
+        # caller holds the event lock
+        del self.holds[hold.hold_id]
+        event = self.events.get(hold.event_id)
+        if event is None:
+            return
+        for sid in hold.seat_ids:
+            seat = event.find_seat(sid)
+            if seat.is_held:
+                seat.release()
+
+    def add_ticket(self, ticket: Ticket):
+        # store an already built ticket (new booking or loaded from storage) and index it
+        ticket.seq = next(self._sequence)
+        self.tickets[ticket.ticket_id] = ticket
+        self._tickets_by_customer.setdefault(ticket.customer_id, []).append(ticket)
+        self._tickets_by_event.setdefault(ticket.event_id, []).append(ticket)
+        if ticket.status == "booked":
+            self._revenue_by_event[ticket.event_id] = self._revenue_by_event.get(ticket.event_id, 0.0) + ticket.price
+        self._mark_ticket_dirty(ticket)
+
     def cancel_ticket(self, ticket_id: str):
         ticket = self.tickets.get(ticket_id)
         if not ticket:
             raise NotFoundError("Ticket not found.")
-        if ticket.status == "cancelled":
-            raise ValidationError("Ticket already cancelled.")
 
         event = self.events.get(ticket.event_id)
-        if event:
-            try:
-                seat = event.find_seat(ticket.seat_id)
-                seat.release()
-            except NotFoundError:
-                # seat missing in event — ignore seat release but continue cancelling ticket
-                pass
+        with event.lock if event else self._orphan_lock:
+            if ticket.status == "cancelled":
+                raise ValidationError("Ticket already cancelled.")
+            if event:
+                try:
+                    seat = event.find_seat(ticket.seat_id)
+                    seat.release()
+                except NotFoundError:
+                    # seat missing in event — ignore seat release but continue cancelling ticket
+                    pass
 
-        ticket.cancel()
+            self._cancel_seq[ticket_id] = next(self._sequence)
+            ticket.cancel()
+            self._revenue_by_event[ticket.event_id] = self._revenue_by_event.get(ticket.event_id, 0.0) - ticket.price
+            self._mark_ticket_dirty(ticket)
+            if self._listeners:
+                self._emit("cancel", ticket)
 
     # -- queries
+    def snapshot(self) -> ManagerSnapshot:
+        # consistent, read-only point-in-time view for reports; use as a context manager
+        return ManagerSnapshot(self)
+
     def list_events(self) -> List[Event]:
         return list(self.events.values())
 
     def list_tickets_for_customer(self, customer_id: str) -> List[Ticket]:
-        return [t for t in self.tickets.values() if t.customer_id == customer_id]
+        return list(self._tickets_by_customer.get(customer_id, []))
+
+    def list_active_tickets_for_customer(self, customer_id: str) -> List[Ticket]:
+        return [t for t in self._tickets_by_customer.get(customer_id, []) if t.status == "booked"]
+
+    def list_tickets_for_event(self, event_id: str) -> List[Ticket]:
+        return list(self._tickets_by_event.get(event_id, []))
+
+    def revenue_for_event(self, event_id: str) -> float:
+        return self._revenue_by_event.get(event_id, 0.0)
 
     # -- helper: seed demo
     def seed_demo(self):
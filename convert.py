@@ -0,0 +1,59 @@
+# Converts booking data between the JSON, XML, binary snapshot and SQLite
+# formats. The format is taken from the file extension (.json, .xml, .bin, .db);
+# a name ending in .shards is a sharded directory (storage.save_sharded).
+#
+#   python convert.py data.json data.bin
+
+import argparse
+import os
+import time
+
+from data.booking_system import BookingManager
+from data import storage, sqlite_store
+
+LOADERS = {
+    ".json": storage.load_from_json_stream,
+    ".xml": storage.load_from_xml_stream,
+    ".bin": storage.load_from_binary,
+    ".db": sqlite_store.load_from_sqlite,
+    ".shards": storage.load_from_sharded,
+}
+
+SAVERS = {
+    ".json": storage.save_to_json,
+    ".xml": storage.save_to_xml,
+    ".bin": storage.save_to_binary,
+    ".db": sqlite_store.save_to_sqlite,
+    ".shards": storage.save_sharded,
+}
+
+
+def file_format(filename: str, table: dict):
+    ext = os.path.splitext(filename.rstrip("/\\"))[1].lower()
+    if ext not in table:
+        raise SystemExit(f"Unsupported format '{ext}' for {filename}; use one of {', '.join(table)}")
+    return table[ext]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert booking data between JSON, XML, binary and SQLite")
+    parser.add_argument("source")
+    parser.add_argument("target")
+    args = parser.parse_args()
+
+    load = file_format(args.source, LOADERS)
+    save = file_format(args.target, SAVERS)
+
+    manager = BookingManager()
+    start = time.perf_counter()
+    load(manager, args.source)
+    loaded = time.perf_counter()
+    save(manager, args.target)
+    saved = time.perf_counter()
+
+    print(f"{len(manager.events)} events, {len(manager.customers)} customers, {len(manager.tickets)} tickets")
+    print(f"load {args.source}: {loaded - start:.3f}s, save {args.target}: {saved - loaded:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# data/ids.py
+
+import os
+import random
+import threading
+import time
+import uuid
+from datetime import datetime
+
+# -------------------------
+# ID generators
+# -------------------------
+# BookingManager takes any callable returning a new unique string id. IDs are
+# only ever compared as strings, so data written with one generator (e.g. the
+# 36-char UUIDs of older data.json files) loads and mixes fine with another.
+#
+# SnowflakeIds (default): 64-bit integers = 42 bits of milliseconds since
+# 2024-01-01, 10 bits of node id, 12 bits of sequence; monotonic per
+# generator and rendered as 13 Crockford base32 characters, so string order is
+# creation order. No os.urandom call per id.
+#
+# ULIDs: 128 bits = 48 bits of Unix milliseconds + 80 random bits, monotonic
+# within a millisecond (the random part is incremented), 26 characters.
+CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+# two base32 digits per lookup
+_PAIRS = [a + b for a in CROCKFORD for b in CROCKFORD]
+
+SNOWFLAKE_EPOCH_MS = 1704067200000   # 2024-01-01T00:00:00Z
+NODE_BITS = 10
+SEQUENCE_BITS = 12
+MAX_NODE = (1 << NODE_BITS) - 1
+_MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+
+def encode_base32(n: int, width: int) -> str:
+    # fixed-width Crockford base32 (width must be even)
+    digits = []
+    for _ in range(width // 2):
+        digits.append(_PAIRS[n & 1023])
+        n >>= 10
+    return "".join(reversed(digits))
+
+
+def decode_base32(s: str) -> int:
+    n = 0
+    for ch in s.upper():
+        n = (n << 5) | CROCKFORD.index(ch)
+    return n
+
+
+def uuid_ids() -> str:
+    return str(uuid.uuid4())
+
+
+class SnowflakeIds:
+    def __init__(self, node: int = None):
+        if node is None:
+            node = os.getpid() & MAX_NODE
+        if not 0 <= node <= MAX_NODE:
+            raise ValueError(f"node must be between 0 and {MAX_NODE}")
+        self.node = node
+        self._last_ms = 0
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def next_int(self) -> int:
+        with self._lock:
+            ms = time.time_ns() // 1_000_000 - SNOWFLAKE_EPOCH_MS
+            if ms > self._last_ms:
+                self._last_ms = ms
+                self._sequence = 0
+            else:
+                # same millisecond or the clock went back: keep counting on the last timestamp
+                self._sequence += 1
+                if self._sequence > _MAX_SEQUENCE:
+                    self._last_ms += 1
+                    self._sequence = 0
+            return (self._last_ms << (NODE_BITS + SEQUENCE_BITS)) | (self.node << SEQUENCE_BITS) | self._sequence
+
+    @staticmethod
+    def render(n: int) -> str:
+        # 64 bits fit in 13 base32 digits; padded to 14 and the leading zero dropped
+        return encode_base32(n, 14)[1:]
+
+    def __call__(self) -> str:
+        return self.render(self.next_int())
+
+
+class ULIDs:
+    def __init__(self, rnd: random.Random = None):
+        self._random = rnd or random.Random(os.urandom(16))
+        self._last_ms = -1
+        self._last_random = 0
+        self._lock = threading.Lock()
+
+    def next_int(self) -> int:
+        with self._lock:
+            ms = time.time_ns() // 1_000_000
+            if ms > self._last_ms:
+                self._last_ms = ms
+                self._last_random = self._random.getrandbits(80)
+            else:
+                self._last_random += 1
+                if self._last_random >> 80:
+                    self._last_ms += 1
+                    self._last_random = self._random.getrandbits(79)
+            return (self._last_ms << 80) | self._last_random
+
+    @staticmethod
+    def render(n: int) -> str:
+        # 128 bits -> 26 base32 digits (130 bits, top two always zero)
+        return encode_base32(n, 26)
+
+    def __call__(self) -> str:
+        return self.render(self.next_int())
+
+
+def id_timestamp_ms(id_str: str) -> int:
+    # creation time encoded in a SnowflakeIds / ULIDs id (Unix milliseconds)
+    n = decode_base32(id_str)
+    if len(id_str) == 26:
+        return n >> 80
+    return (n >> (NODE_BITS + SEQUENCE_BITS)) + SNOWFLAKE_EPOCH_MS
+
+
+# -------------------------
+# Timestamps
+# -------------------------
+# Same text as datetime.utcnow().isoformat(), but the date/time part is only
+# formatted once per second; only the microseconds are appended per call.
+_second_cache = (None, "")
+
+
+def utc_isoformat() -> str:
+    global _second_cache
+    ns = time.time_ns()
+    sec, us = divmod(ns // 1000, 1_000_000)
+    cached_sec, prefix = _second_cache
+    if sec != cached_sec:
+        prefix = datetime.utcfromtimestamp(sec).isoformat()
+        _second_cache = (sec, prefix)
+    return f"{prefix}.{us:06d}" if us else prefix
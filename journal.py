@@ -0,0 +1,237 @@
+# data/journal.py
+
+import json
+import os
+import threading
+from typing import Any, List, Optional
+
+from data.booking_system import BookingManager, Seat
+from data.exceptions import NotFoundError
+from data import storage
+
+# -------------------------
+# Write-ahead journal
+# -------------------------
+# Every add_event / register_customer / add_seat / book / cancel is appended
+# to the log as one compact JSON line. On open() the snapshot is loaded and
+# the journal tail replayed on top of it; compact() rewrites the snapshot and
+# truncates the log. Replay is idempotent, so a crash between writing the
+# snapshot and truncating the log is harmless. The snapshot is not taken under
+# the event locks: a cancel caught half-way (ticket cancelled, seat still
+# reserved) is repaired when its record is replayed.
+class Journal:
+    def __init__(self, manager: BookingManager, snapshot: Optional[str] = "data.json", log: str = "data.journal",
+                 fsync_every: int = 1, compact_every: int = 0):
+        self.manager = manager
+        # None: the caller loads and saves the manager itself (e.g. data.lazy); open()
+        # only replays the log and truncate() drops what the caller has saved
+        self.snapshot = snapshot
+        self.log = log
+        self.fsync_every = fsync_every        # records per fsync; 0 = leave flushing to the OS
+        self.compact_every = compact_every    # records between automatic compactions; 0 = never
+        self._lock = threading.Lock()
+        self._file = None
+        self._pending = 0
+        self._since_compact = 0
+        self._listening = False
+        self.log_size = 0     # bytes of the log written so far
+
+    # -- lifecycle
+    def open(self, listen: bool = True):
+        # listen=False: the caller feeds write_lines() itself (e.g. from a background writer)
+        if self.snapshot is not None:
+            if os.path.exists(self.snapshot):
+                storage.load_from_json(self.manager, self.snapshot)
+            else:
+                self.manager.clear()
+        self._since_compact = self.replay()
+        self._file = open(self.log, "a", encoding="utf-8")
+        self.log_size = self._file.tell()
+        if listen:
+            self.manager.add_listener(self._on_change)
+            self._listening = True
+
+    def close(self):
+        if self._file is None:
+            return
+        if self._listening:
+            self.manager.remove_listener(self._on_change)
+            self._listening = False
+        with self._lock:
+            self._sync()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- writing
+    @staticmethod
+    def encode(op: str, obj: Any) -> Optional[str]:
+        if op == "add_event":
+            rec = {"op": op, "event": storage.event_to_dict(obj)}
+        elif op == "register_customer":
+            rec = {"op": op, "customer": storage.customer_to_dict(obj)}
+        elif op == "add_seat":
+            event_id, seat = obj
+            rec = {"op": op, "event_id": event_id,
+                   "seat": {"seat_id": seat.seat_id, "row": seat.row, "number": seat.number, "price": seat.price,
+                            "is_reserved": seat.is_reserved}}
+        elif op == "book":
+            rec = {"op": op, "tickets": [storage.ticket_to_dict(t) for t in obj]}
+        elif op == "cancel":
+            rec = {"op": op, "ticket_id": obj.ticket_id}
+        else:
+            return None
+        return json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+    def _on_change(self, op: str, obj: Any):
+        line = self.encode(op, obj)
+        if line is not None:
+            self.write_lines([line])
+
+    def write_lines(self, lines: List[str], sync: bool = False):
+        # sync=True forces an fsync after this batch (group commit)
+        with self._lock:
+            self._file.write("".join(lines))
+            self._pending += len(lines)
+            self._since_compact += len(lines)
+            if sync or (self.fsync_every and self._pending >= self.fsync_every):
+                self._sync()
+            else:
+                self._file.flush()
+            self.log_size = self._file.tell()
+        if self.compact_every and self.snapshot is not None and self._since_compact >= self.compact_every:
+            self.compact()
+
+    def _sync(self):
+        if self._pending:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending = 0
+
+    def flush(self):
+        with self._lock:
+            self._sync()
+
+    # -- replay / compaction
+    def replay(self) -> int:
+        if not os.path.exists(self.log):
+            return 0
+        count = good = 0
+        with open(self.log, "rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete record")
+                    rec = json.loads(line)
+                except ValueError:
+                    # torn last record after a crash: drop it so new records start on a clean line
+                    break
+                apply_record(self.manager, rec)
+                good += len(line)
+                count += 1
+        if good != os.path.getsize(self.log):
+            with open(self.log, "rb+") as f:
+                f.truncate(good)
+        return count
+
+    def compact(self):
+        # may run in a worker thread beside the mutations: records are written only
+        # after the lock is released, so every record dropped here is in the snapshot,
+        # and changes caught half-way are completed by replaying their records
+        with self._lock:
+            tmp = self.snapshot + ".tmp"
+            storage.save_to_json(self.manager, tmp)
+            with open(tmp, "rb+") as f:
+                os.fsync(f.fileno())
+            os.replace(tmp, self.snapshot)
+            self._drop(None)
+
+    def truncate(self, mark: Optional[int] = None):
+        # drops the records up to mark (all when None) once their changes are saved
+        # elsewhere, e.g. by LazyStore.save() for a journal without snapshot
+        with self._lock:
+            self._drop(mark)
+
+    def _drop(self, mark: Optional[int]):
+        if self._file is not None:
+            self._sync()
+        if mark is None or mark >= self.log_size:
+            if self._file is not None:
+                self._file.truncate(0)
+                self._file.seek(0)
+            else:
+                open(self.log, "w").close()
+        else:
+            self._cut_log(mark)
+        self.log_size = self._file.tell() if self._file is not None else os.path.getsize(self.log)
+        self._since_compact = 0
+
+    def _cut_log(self, mark: int):
+        with open(self.log, "rb") as f:
+            f.seek(mark)
+            tail = f.read()
+        tmp = self.log + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(tail)
+            f.flush()
+            os.fsync(f.fileno())
+        if self._file is not None:
+            self._file.close()
+        os.replace(tmp, self.log)
+        if self._file is not None:
+            self._file = open(self.log, "a", encoding="utf-8")
+
+
+def apply_record(manager: BookingManager, rec: dict):
+    op = rec.get("op")
+    if op == "add_event":
+        evt = storage.event_from_dict(rec["event"])
+        manager.events.setdefault(evt.event_id, evt)
+    elif op == "register_customer":
+        cust = storage.customer_from_dict(rec["customer"])
+        manager.customers.setdefault(cust.customer_id, cust)
+    elif op == "add_seat":
+        event = manager.events.get(rec["event_id"])
+        s = rec["seat"]
+        # the snapshot may already hold the seat
+        if event is not None and s["seat_id"] not in event.seats.index:
+            manager.add_seat(event.event_id, Seat(s["seat_id"], s["row"], int(s["number"]), float(s["price"]),
+                                                  bool(s.get("is_reserved", False))))
+    elif op == "book":
+        for t in rec["tickets"]:
+            if t["ticket_id"] not in manager.tickets:
+                storage.restore_ticket(manager, storage.ticket_from_dict(t))
+    elif op == "cancel":
+        ticket = manager.tickets.get(rec["ticket_id"])
+        if ticket is None:
+            return
+        if ticket.status != "cancelled":
+            manager.cancel_ticket(ticket.ticket_id)
+        else:
+            _release_seat(manager, ticket)
+
+
+def _release_seat(manager: BookingManager, ticket):
+    # a snapshot written while the cancel was in flight can hold the cancelled
+    # ticket together with its still reserved seat; free the seat unless a
+    # booked ticket has it by now
+    event = manager.events.get(ticket.event_id)
+    if event is None:
+        return
+    with event.lock:
+        for t in manager._tickets_by_event.get(ticket.event_id, ()):
+            if t.seat_id == ticket.seat_id and t.status == "booked":
+                return
+        try:
+            seat = event.find_seat(ticket.seat_id)
+        except NotFoundError:
+            return
+        if seat.is_reserved and not seat.is_held:
+            seat.release()
+            manager.mark_event_dirty(ticket.event_id)
@@ -0,0 +1,262 @@
+# data/lazy.py
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from data.booking_system import BookingManager, Event, Seat, SeatBlock, SEAT_BOOKED, SEAT_FREE, SEAT_HELD
+from data import storage
+
+# -------------------------
+# Lazy loading from a sharded directory
+# -------------------------
+# open() reads only the manifest (event headers), the customer buckets and
+# the tickets; every event starts without seats and reads its events/<id>.json
+# file the first time .seats is touched. Loaded seat blocks are kept in LRU
+# order and, once their estimated size exceeds memory_budget, the least
+# recently used ones are dropped again. Only blocks that match their file
+# can be dropped: any seat change pins the event until save() has written it,
+# and events with held seats, availability subscribers or open snapshots stay
+# loaded.
+def block_bytes(block: SeatBlock) -> int:
+    # rough resident size; row strings are interned and shared, so not counted
+    n = len(block)
+    return (sys.getsizeof(block.ids) + sum(map(sys.getsizeof, block.ids)) + sys.getsizeof(block.rows)
+            + sys.getsizeof(block.index) + n * (block.numbers.itemsize + block.prices.itemsize + 1))
+
+
+class LazyEvent(Event):
+    def __init__(self, event_id: str, name: str, date: str, location: str, store: "LazyStore", filename: str,
+                 saved_available: Optional[int] = None, saved_total: Optional[int] = None):
+        self._store = store
+        self.filename = filename
+        # free / all seats as stored in the file; answer the counts below while unloaded
+        self.saved_available = saved_available
+        self.saved_total = saved_total
+        self._watcher = None
+        # called as hook(block) under the lock when the seats get loaded, or hook(None)
+        # just before they are replaced while unloaded (open snapshots)
+        self.load_hooks = []
+        Event.__init__(self, event_id, name, date, location, seats=None)
+
+    def __post_init__(self):
+        pass
+
+    @property
+    def seats(self) -> SeatBlock:
+        block = self._seats
+        if block is None:
+            return self._store.load_seats(self)
+        self._store.touch(self.event_id)
+        return block
+
+    @seats.setter
+    def seats(self, block: Optional[SeatBlock]):
+        if block is None:
+            self._seats = None
+        else:
+            # replaced from outside: keep it resident until saved
+            self._store.adopt(self, block)
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._seats is not None
+
+    def count_seats(self) -> int:
+        block = self._seats
+        if block is None and self.saved_total is not None:
+            return self.saved_total
+        return len(self.seats)
+
+    def count_available_seats(self) -> int:
+        block = self._seats
+        if block is None and self.saved_available is not None:
+            return self.saved_available
+        return self.seats.available_count
+
+    def add_seat(self, seat: Seat):
+        with self.lock:
+            super().add_seat(seat)
+            self._store.mark_changed(self.event_id)
+
+    def saved_states(self) -> bytes:
+        # SEAT_FREE / SEAT_BOOKED per seat as stored in the file
+        try:
+            data = storage._read_json(self.filename)
+        except (OSError, ValueError) as e:
+            raise RuntimeError(f"Error reading seats of event {self.event_id}: {e}")
+        return bytes(SEAT_BOOKED if s.get("is_reserved") else SEAT_FREE for s in data.get("seats", []))
+
+
+class LazyStore:
+    def __init__(self, manager: BookingManager, directory: str = "data_shards", memory_budget: int = 256 << 20):
+        self.manager = manager
+        self.directory = directory
+        self.memory_budget = memory_budget
+        self._resident: "OrderedDict[str, int]" = OrderedDict()   # event_id -> bytes, least recent first
+        self._resident_bytes = 0
+        self._changes: Dict[str, int] = {}    # event_id -> seat changes not yet saved
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+
+    def open(self):
+        manifest = storage.read_shard_manifest(self.directory)
+        manager = self.manager
+        manager.clear()
+        with self._lock:
+            self._resident.clear()
+            self._resident_bytes = 0
+            self._changes.clear()
+        try:
+            for entry in manifest.get("events", []):
+                eid, name = entry[0], entry[1]
+                filename = os.path.join(self.directory, "events", name)
+                if len(entry) >= 5:
+                    available = entry[5] if len(entry) >= 6 else None
+                    total = entry[6] if len(entry) >= 7 else None
+                    manager.events[eid] = LazyEvent(eid, entry[2], entry[3], entry[4], self, filename, available, total)
+                else:
+                    # manifest without headers: read the event once, seats are kept loaded
+                    evt = storage.event_from_dict(storage._read_json(filename))
+                    lazy = LazyEvent(eid, evt.name, evt.date, evt.location, self, filename)
+                    self._attach(lazy, evt.seats)
+                    manager.events[eid] = lazy
+            storage.load_shard_customers(manager, self.directory)
+            # seat states are in the event files already; only index the tickets
+            for ticket in storage.iter_shard_tickets(self.directory, manifest):
+                manager.add_ticket(ticket)
+        except (OSError, ValueError, KeyError) as e:
+            raise RuntimeError(f"Error reading shards: {e}")
+        manager.mark_clean()
+        self._evict()
+
+    def save(self) -> int:
+        # writes the changed shards; events saved unchanged become evictable again
+        changes = dict(self._changes)
+        written = storage.save_sharded(self.manager, self.directory)
+        for eid, count in changes.items():
+            event = self.manager.events.get(eid)
+            if event is None:
+                self._changes.pop(eid, None)
+                continue
+            with event.lock:
+                if self._changes.get(eid) == count:
+                    del self._changes[eid]
+        self._evict()
+        return written
+
+    @property
+    def resident_bytes(self) -> int:
+        return self._resident_bytes
+
+    # -- residency
+    def load_seats(self, event: LazyEvent) -> SeatBlock:
+        with event.lock:
+            block = event._seats
+            if block is None:
+                try:
+                    block = storage.event_from_dict(storage._read_json(event.filename)).seats
+                except (OSError, ValueError, KeyError) as e:
+                    raise RuntimeError(f"Error reading seats of event {event.event_id}: {e}")
+                self._attach(event, block)
+                self._run_load_hooks(event, block)
+                self.loads += 1
+        self._evict(keep=event.event_id)
+        return block
+
+    def adopt(self, event: LazyEvent, block: SeatBlock):
+        with event.lock:
+            if event._seats is None:
+                self._run_load_hooks(event, None)
+            if event._watcher is not None and event._seats is not None:
+                event._seats.watchers.remove(event._watcher)
+            self._forget(event.event_id)
+            self._attach(event, block)
+            self.mark_changed(event.event_id)
+
+    def _attach(self, event: LazyEvent, block: SeatBlock):
+        eid = event.event_id
+        changes = self._changes
+
+        def watcher(pos: int, old: int, new: int):
+            changes[eid] = changes.get(eid, 0) + 1
+        block.watchers.append(watcher)
+        event._watcher = watcher
+        event._seats = block
+        size = block_bytes(block)
+        with self._lock:
+            self._resident[eid] = size
+            self._resident_bytes += size
+
+    @staticmethod
+    def _run_load_hooks(event: LazyEvent, block: Optional[SeatBlock]):
+        hooks, event.load_hooks = event.load_hooks, []
+        for hook in hooks:
+            hook(block)
+
+    def _forget(self, eid: str):
+        with self._lock:
+            size = self._resident.pop(eid, None)
+            if size is not None:
+                self._resident_bytes -= size
+
+    def touch(self, eid: str):
+        # _evict() walks _resident under the lock from other threads
+        with self._lock:
+            if eid in self._resident:
+                self._resident.move_to_end(eid)
+
+    def mark_changed(self, eid: str):
+        # a change that seat watchers do not see (added seats, replaced block): pin the
+        # event and have the next save write its shard
+        self._changes[eid] = self._changes.get(eid, 0) + 1
+        self.manager.mark_event_dirty(eid)
+
+    def _evict(self, keep: Optional[str] = None):
+        while self._resident_bytes > self.memory_budget:
+            with self._lock:
+                candidates = [eid for eid in self._resident if eid != keep and not self._changes.get(eid)]
+            if not any(self._evict_event(self.manager.events.get(eid)) for eid in candidates):
+                break
+
+    def _evict_event(self, event) -> bool:
+        if not isinstance(event, LazyEvent) or not event.lock.acquire(blocking=False):
+            return False
+        try:
+            block = event._seats
+            if block is None or self._changes.get(event.event_id) or SEAT_HELD in block.reserved:
+                return False
+            search, availability = event._search, event._availability
+            if availability is not None and availability.subscribers:
+                return False
+            allowed = [event._watcher]
+            if search is not None:
+                allowed.append(search.on_change)
+            if availability is not None:
+                allowed.append(availability.on_change)
+            if any(w not in allowed for w in block.watchers):
+                return False    # e.g. an open snapshot
+            if search is not None:
+                search.detach()
+            if availability is not None:
+                availability.detach()
+            block.watchers.remove(event._watcher)
+            event.saved_available = block.available_count
+            event.saved_total = len(block)
+            event._search = event._availability = None
+            event._seats = None
+            event._watcher = None
+            self._forget(event.event_id)
+            self.evictions += 1
+            return True
+        finally:
+            event.lock.release()
+
+
+def open_lazy(manager: BookingManager, directory: str = "data_shards", memory_budget: int = 256 << 20) -> LazyStore:
+    store = LazyStore(manager, directory, memory_budget)
+    store.open()
+    return store
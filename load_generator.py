@@ -0,0 +1,86 @@
+# Load generator for service.py: opens many concurrent client connections
+# and measures request throughput and latency of book_seat / cancel_ticket.
+#
+#   python service.py --journal '' &
+#   python load_generator.py --connections 64 --requests 500
+
+import argparse
+import asyncio
+import random
+import time
+
+from data.service import BookingClient, ServiceError
+
+
+async def setup(host: str, port: int, num_events: int, num_seats: int, num_customers: int):
+    client = await BookingClient.connect(host, port)
+    event_ids = []
+    for e in range(num_events):
+        seats = [{"seat_id": f"S{i}", "row": f"R{i // 50}", "number": i % 50 + 1, "price": 50.0}
+                 for i in range(num_seats)]
+        evt = await client.call("add_event", name=f"Load event {e}", date="2025-11-15", location="Arena",
+                                seats=seats)
+        event_ids.append(evt["event_id"])
+    customer_ids = []
+    for c in range(num_customers):
+        cust = await client.call("register_customer", name=f"Load customer {c}", email=f"c{c}@example.com")
+        customer_ids.append(cust["customer_id"])
+    await client.close()
+    return event_ids, customer_ids
+
+
+async def run_client(host: str, port: int, event_ids, num_seats: int, customer_ids, requests: int,
+                     seed: int, latencies: list):
+    rnd = random.Random(seed)
+    client = await BookingClient.connect(host, port)
+    own = []
+    rejected = 0
+    clock = time.perf_counter
+    for _ in range(requests):
+        start = clock()
+        try:
+            if own and rnd.random() < 0.3:
+                await client.call("cancel_ticket", ticket_id=own.pop(rnd.randrange(len(own))))
+            else:
+                t = await client.call("book_seat", event_id=rnd.choice(event_ids),
+                                      seat_id=f"S{rnd.randrange(num_seats)}", customer_id=rnd.choice(customer_ids))
+                own.append(t["ticket_id"])
+        except ServiceError:
+            rejected += 1
+        latencies.append(clock() - start)
+    await client.close()
+    return rejected
+
+
+async def run(args):
+    event_ids, customer_ids = await setup(args.host, args.port, args.events, args.seats, args.customers)
+    latencies = []
+    start = time.perf_counter()
+    rejected = await asyncio.gather(*(
+        run_client(args.host, args.port, event_ids, args.seats, customer_ids, args.requests, args.seed + i, latencies)
+        for i in range(args.connections)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    total = len(latencies)
+    print(f"connections={args.connections} requests={total} time={elapsed:.2f}s "
+          f"throughput={total / elapsed:,.0f} req/s rejected={sum(rejected)}")
+    for q in (0.50, 0.95, 0.99):
+        print(f"p{int(q * 100)} latency: {latencies[min(total - 1, int(q * total))] * 1e3:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load generator for the booking service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=500, help="requests per connection")
+    parser.add_argument("--events", type=int, default=4)
+    parser.add_argument("--seats", type=int, default=2000)
+    parser.add_argument("--customers", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
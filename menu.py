@@ -4,6 +4,9 @@ import os
 from data.booking_system import BookingManager, Seat
 from data import storage
 from data.exceptions import BookingError
+from data.lazy import open_lazy
+
+SHARDS_DIR = "data_shards"
 
 # -------------------------
 # Функция для очистки консоли
@@ -30,6 +33,7 @@ def print_seat_table(seats):
 # -------------------------
 def run_menu():
     manager = BookingManager()  # создаем менеджер бронирования
+    lazy_store = None           # при ленивой загрузке места подгружаются из SHARDS_DIR по требованию
     while True:
         clear_screen()
         print("--- Система бронирования билетов ---")
@@ -41,6 +45,7 @@ def run_menu():
         print("6. Показать доступные места")
         print("7. Сохранить данные")
         print("8. Загрузить данные")
+        print("9. Подобрать места рядом")
         print("0. Выход")
 
         choice = input("Выберите действие: ").strip()
@@ -80,8 +85,11 @@ def run_menu():
                 print("События отсутствуют.")
             else:
                 for e in events:
+                    # не загружаем места событий, которые ещё не открывались
+                    min_price = e.availability().min_price if getattr(e, "is_loaded", True) else None
+                    price = f", от {min_price}" if min_price is not None else ""
                     print(
-                        f"{e.event_id} - {e.name} ({e.date}) в {e.location}, доступных мест: {len(e.get_available_seats())}"
+                        f"{e.event_id} - {e.name} ({e.date}) в {e.location}, доступных мест: {e.count_available_seats()}{price}"
                     )
             input("\nНажмите Enter, чтобы продолжить...")
 
@@ -134,20 +142,58 @@ def run_menu():
             try:
                 storage.save_to_json(manager)
                 storage.save_to_xml(manager)
-                print("Данные успешно сохранены в JSON и XML.")
+                if lazy_store is not None:
+                    lazy_store.save()
+                else:
+                    storage.save_sharded(manager, SHARDS_DIR)
+                print("Данные успешно сохранены в JSON, XML и каталог шардов.")
             except Exception as e:
                 print("Ошибка при сохранении данных:", e)
             input("\nНажмите Enter, чтобы продолжить...")
 
         elif choice == "8":
             try:
-                storage.load_from_json(manager)
-                storage.load_from_xml(manager)
-                print("Данные успешно загружены из JSON и XML.")
+                # один источник: шарды (лениво), иначе JSON, иначе XML
+                if os.path.exists(os.path.join(SHARDS_DIR, "manifest.json")):
+                    lazy_store = open_lazy(manager, SHARDS_DIR)
+                    print("Данные загружены из каталога шардов (места подгружаются по требованию).")
+                elif os.path.exists("data.json"):
+                    lazy_store = None
+                    storage.load_from_json(manager)
+                    print("Данные успешно загружены из JSON.")
+                else:
+                    lazy_store = None
+                    storage.load_from_xml(manager)
+                    print("Данные успешно загружены из XML.")
             except Exception as e:
                 print("Ошибка при загрузке данных:", e)
             input("\nНажмите Enter, чтобы продолжить...")
 
+        elif choice == "9":
+            try:
+                event_id = input("ID события: ").strip()
+                event = manager.events.get(event_id)
+                if not event:
+                    print("Событие не найдено.")
+                else:
+                    count = int(input("Сколько мест рядом: ").strip())
+                    max_price = input("Максимальная цена места ($, Enter - без ограничения): ").strip()
+                    seats = event.find_best_seats(count, max_price=float(max_price) if max_price else None)
+                    if not seats:
+                        print("Подходящих мест рядом не найдено.")
+                    else:
+                        print_seat_table(seats)
+                        answer = input("\nЗабронировать эти места? (y/n): ").strip().lower()
+                        if answer == "y":
+                            customer_id = input("Введите ID клиента: ").strip()
+                            tickets = manager.book_seats(event_id, [s.seat_id for s in seats], customer_id)
+                            print(f"\nЗабронировано билетов: {len(tickets)}")
+            except BookingError as e:
+                print("Ошибка бронирования:", e)
+            except Exception as e:
+                print("Неизвестная ошибка:", e)
+            input("\nНажмите Enter, чтобы продолжить...")
+
         elif choice == "0":
             print("Выход из программы...")
             break
@@ -0,0 +1,222 @@
+# data/metrics.py
+
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+
+# -------------------------
+# Metrics registry
+# -------------------------
+# Opt-in: nothing is measured until instrument() / instrument_storage() wrap
+# the methods and functions, and uninstrument() puts the originals back, so a
+# process that never enables metrics runs the plain code with no checks at all.
+
+# latency histogram bucket upper bounds, seconds
+LATENCY_BUCKETS = (
+    5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+    1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+MANAGER_METHODS = (
+    "add_event", "register_customer", "book_seat", "book_seats", "book_bulk", "cancel_ticket",
+    "hold_seats", "confirm_hold", "release_hold",
+    "list_events", "list_tickets_for_customer", "list_active_tickets_for_customer",
+    "list_tickets_for_event", "revenue_for_event",
+)
+
+# (function name, "read" | "write")
+STORAGE_FUNCTIONS = (
+    ("save_to_json", "write"), ("load_from_json", "read"), ("load_from_json_stream", "read"),
+    ("save_to_xml", "write"), ("load_from_xml", "read"), ("load_from_xml_stream", "read"),
+    ("save_to_binary", "write"), ("load_from_binary", "read"),
+    ("save_sharded", "write"), ("load_from_sharded", "read"),
+)
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)   # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls: Dict[str, int] = {}
+        self.latency: Dict[str, _Histogram] = {}
+        self.errors: Dict[Tuple[str, str], int] = {}
+        self.bytes_read: Dict[str, int] = {}
+        self.bytes_written: Dict[str, int] = {}
+        self._patched: List[Tuple[object, str, object, bool]] = []
+        self._local = threading.local()   # .active: an instrumented call is running on this thread
+
+    def reset(self):
+        with self._lock:
+            self.calls.clear()
+            self.latency.clear()
+            self.errors.clear()
+            self.bytes_read.clear()
+            self.bytes_written.clear()
+
+    # -- recording
+    def observe(self, op: str, seconds: float, error: Optional[BaseException] = None):
+        with self._lock:
+            self.calls[op] = self.calls.get(op, 0) + 1
+            hist = self.latency.get(op)
+            if hist is None:
+                hist = self.latency[op] = _Histogram()
+            hist.observe(seconds)
+            if error is not None:
+                key = (op, type(error).__name__)
+                self.errors[key] = self.errors.get(key, 0) + 1
+
+    def add_bytes(self, op: str, read: int = 0, written: int = 0):
+        with self._lock:
+            if read:
+                self.bytes_read[op] = self.bytes_read.get(op, 0) + read
+            if written:
+                self.bytes_written[op] = self.bytes_written.get(op, 0) + written
+
+    def timed(self, op: str, fn: Callable) -> Callable:
+        clock = time.perf_counter
+        observe = self.observe
+        local = self._local
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if getattr(local, "active", False):
+                # called from inside another instrumented call (book_seats -> book_bulk,
+                # save_sharded -> manager queries): only the outer call is what the caller did
+                return fn(*args, **kwargs)
+            local.active = True
+            start = clock()
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                observe(op, clock() - start, e)
+                raise
+            finally:
+                local.active = False
+            observe(op, clock() - start)
+            return result
+        return wrapper
+
+    # -- enabling / disabling
+    def instrument(self, manager, methods=MANAGER_METHODS):
+        # wraps the bound methods on this manager instance only
+        for name in methods:
+            original = getattr(manager, name)
+            self._patched.append((manager, name, original, False))
+            setattr(manager, name, self.timed(name, original))
+
+    def instrument_storage(self, module=None, functions=STORAGE_FUNCTIONS):
+        # wraps module-level save/load functions; callers that look them up on the
+        # module (storage.save_to_json(...)) go through the wrapper
+        if module is None:
+            from data import storage as module
+        for name, direction in functions:
+            original = getattr(module, name, None)
+            if original is None:
+                continue
+            self._patched.append((module, name, original, True))
+            setattr(module, name, self._storage_wrapper(name, direction, original))
+
+    def uninstrument(self):
+        while self._patched:
+            target, name, original, is_module = self._patched.pop()
+            if is_module:
+                setattr(target, name, original)
+            else:
+                # drop the instance attribute so the class method is used again
+                target.__dict__.pop(name, None)
+
+    def _storage_wrapper(self, name: str, direction: str, fn: Callable) -> Callable:
+        timed = self.timed(name, fn)
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind_partial(*args, **kwargs)
+            bound.apply_defaults()
+            if "stats" in bound.arguments:
+                # the function counts the bytes it actually read / wrote (sharded directories)
+                stats = bound.arguments["stats"]
+                if stats is None:
+                    stats = bound.arguments["stats"] = {}
+                before = stats.get("bytes", 0)
+                result = timed(*bound.args, **bound.kwargs)
+                size = stats.get("bytes", 0) - before
+            else:
+                result = timed(*args, **kwargs)
+                size = _path_size(bound.arguments.get("filename"))
+            if direction == "read":
+                self.add_bytes(name, read=size)
+            else:
+                self.add_bytes(name, written=size)
+            return result
+        return wrapper
+
+    # -- export
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "calls": dict(self.calls),
+                "latency": {
+                    op: {"buckets": dict(zip([str(b) for b in LATENCY_BUCKETS] + ["+Inf"], h.counts)),
+                         "sum": h.total, "count": h.count}
+                    for op, h in self.latency.items()
+                },
+                "errors": [{"op": op, "error": err, "count": n} for (op, err), n in self.errors.items()],
+                "bytes_read": dict(self.bytes_read),
+                "bytes_written": dict(self.bytes_written),
+            }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self, prefix: str = "booking") -> str:
+        snap = self.snapshot()
+        lines = [f"# TYPE {prefix}_calls_total counter"]
+        for op, n in sorted(snap["calls"].items()):
+            lines.append(f'{prefix}_calls_total{{op="{op}"}} {n}')
+
+        lines.append(f"# TYPE {prefix}_errors_total counter")
+        for e in sorted(snap["errors"], key=lambda e: (e["op"], e["error"])):
+            lines.append(f'{prefix}_errors_total{{op="{e["op"]}",error="{e["error"]}"}} {e["count"]}')
+
+        lines.append(f"# TYPE {prefix}_latency_seconds histogram")
+        for op, h in sorted(snap["latency"].items()):
+            cumulative = 0
+            for le, n in h["buckets"].items():
+                cumulative += n
+                lines.append(f'{prefix}_latency_seconds_bucket{{op="{op}",le="{le}"}} {cumulative}')
+            lines.append(f'{prefix}_latency_seconds_sum{{op="{op}"}} {h["sum"]!r}')
+            lines.append(f'{prefix}_latency_seconds_count{{op="{op}"}} {h["count"]}')
+
+        for kind in ("read", "written"):
+            lines.append(f"# TYPE {prefix}_storage_bytes_{kind}_total counter")
+            for op, n in sorted(snap[f"bytes_{kind}"].items()):
+                lines.append(f'{prefix}_storage_bytes_{kind}_total{{op="{op}"}} {n}')
+        return "\n".join(lines) + "\n"
+
+
+def _path_size(path) -> int:
+    if not isinstance(path, str):
+        return 0
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
@@ -0,0 +1,141 @@
+# data/seat_search.py
+
+from typing import Dict, List, Optional
+
+from data.seat_states import SEAT_FREE
+
+# -------------------------
+# Per-row free-run index
+# -------------------------
+# Seats of a row are ordered by number; two seats are side by side when their
+# numbers differ by one. For every row the index keeps the maximal runs of
+# free, side-by-side seats (start -> end and end -> start, as offsets into the
+# row) plus the longest run length, and updates them from SeatBlock state
+# changes. A search only looks at rows whose longest run is long enough and
+# only at runs of that length, instead of scanning the whole house.
+class _Row:
+    __slots__ = ("index", "positions", "adjacent", "run_end", "run_start", "max_run", "min_price", "max_price")
+
+    def __init__(self, index: int, positions: List[int], numbers, prices):
+        self.index = index
+        self.positions = positions
+        self.min_price = min(prices[p] for p in positions)
+        self.max_price = max(prices[p] for p in positions)
+        # adjacent[k]: seat k and seat k + 1 are side by side
+        self.adjacent = [numbers[positions[k + 1]] == numbers[positions[k]] + 1 for k in range(len(positions) - 1)]
+        self.run_end: Dict[int, int] = {}
+        self.run_start: Dict[int, int] = {}
+        self.max_run = 0
+
+    def add_run(self, start: int, end: int):
+        self.run_end[start] = end
+        self.run_start[end] = start
+        if end - start + 1 > self.max_run:
+            self.max_run = end - start + 1
+
+    def remove_run(self, start: int) -> int:
+        end = self.run_end.pop(start)
+        del self.run_start[end]
+        return end
+
+    def recompute_max(self):
+        self.max_run = max((e - s + 1 for s, e in self.run_end.items()), default=0)
+
+
+class RowRunIndex:
+    def __init__(self, block):
+        self.block = block
+        self.rows: List[_Row] = []
+        self.by_price: List[_Row] = []     # rows ordered by cheapest seat, for early exit in find()
+        self.row_of: Dict[int, int] = {}   # block position -> row number in self.rows
+        self.slot_of: Dict[int, int] = {}  # block position -> offset within its row
+
+        by_row: Dict[str, List[int]] = {}
+        for pos, row in enumerate(block.rows):
+            by_row.setdefault(row, []).append(pos)
+        numbers, prices, states = block.numbers, block.prices, block.reserved
+        for r, positions in enumerate(by_row.values()):
+            positions.sort(key=numbers.__getitem__)
+            row = _Row(r, positions, numbers, prices)
+            start = None
+            for k, pos in enumerate(positions):
+                self.row_of[pos] = r
+                self.slot_of[pos] = k
+                if states[pos] == SEAT_FREE:
+                    if start is None:
+                        start = k
+                    if k == len(positions) - 1 or not row.adjacent[k] or states[positions[k + 1]] != SEAT_FREE:
+                        row.add_run(start, k)
+                        start = None
+            self.rows.append(row)
+        self.by_price = sorted(self.rows, key=lambda row: (row.min_price, row.index))
+        block.watchers.append(self.on_change)
+
+    def detach(self):
+        self.block.watchers.remove(self.on_change)
+
+    def on_change(self, pos: int, old: int, new: int):
+        if (old == SEAT_FREE) == (new == SEAT_FREE):
+            return
+        row = self.rows[self.row_of[pos]]
+        k = self.slot_of[pos]
+        if new == SEAT_FREE:
+            start = end = k
+            if k > 0 and row.adjacent[k - 1] and (k - 1) in row.run_start:
+                start = row.run_start[k - 1]
+                row.remove_run(start)
+            if k + 1 < len(row.positions) and row.adjacent[k] and (k + 1) in row.run_end:
+                end = row.remove_run(k + 1)
+            row.add_run(start, end)
+        else:
+            # walk left to the start of the run that contains k
+            states = self.block.reserved
+            start = k
+            while start > 0 and row.adjacent[start - 1] and states[row.positions[start - 1]] == SEAT_FREE:
+                start -= 1
+            end = row.remove_run(start)
+            was_longest = end - start + 1 == row.max_run
+            if start <= k - 1:
+                row.add_run(start, k - 1)
+            if k + 1 <= end:
+                row.add_run(k + 1, end)
+            if was_longest:
+                row.recompute_max()
+
+    def find(self, count: int, min_price: Optional[float] = None, max_price: Optional[float] = None) -> List[int]:
+        # cheapest total wins; ties go to the earlier row, then the lower seat number
+        prices = self.block.prices
+        best = None
+        best_key = None
+        for row in self.by_price:
+            if best_key is not None:
+                bound = row.min_price * count
+                if bound > best_key[0] + 1e-9:
+                    break       # no later row can be cheaper
+                if bound >= best_key[0] - 1e-9 and row.index > best_key[1]:
+                    continue    # at best a tie, and ties go to the earlier row
+            if row.max_run < count:
+                continue
+            if (min_price is not None and row.max_price < min_price) or \
+               (max_price is not None and row.min_price > max_price):
+                continue
+            for start in sorted(s for s, e in row.run_end.items() if e - s + 1 >= count):
+                end = row.run_end[start]
+                window = 0.0
+                ok = 0   # length of the current streak of seats within the price range
+                for k in range(start, end + 1):
+                    price = prices[row.positions[k]]
+                    if (min_price is not None and price < min_price) or (max_price is not None and price > max_price):
+                        ok = 0
+                        window = 0.0
+                        continue
+                    ok += 1
+                    window += price
+                    if ok > count:
+                        window -= prices[row.positions[k - count]]
+                    if ok >= count:
+                        key = (round(window, 9), row.index, k)
+                        if best_key is None or key < best_key:
+                            best_key = key
+                            best = row.positions[k - count + 1:k + 1]
+        return best or []
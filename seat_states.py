@@ -0,0 +1,11 @@
+# data/seat_states.py
+
+# -------------------------
+# Seat states
+# -------------------------
+# One byte per seat in SeatBlock.reserved. Kept apart from booking_system so
+# the modules that watch seat blocks (seat_search, availability, snapshots)
+# can use the same values without a circular import.
+SEAT_FREE = 0
+SEAT_BOOKED = 1
+SEAT_HELD = 2    # temporarily held for a checkout, see BookingManager.hold_seats
@@ -0,0 +1,360 @@
+# Asyncio booking service: newline-delimited JSON over TCP.
+#
+# Request:  {"id": 1, "op": "book_seat", "args": {"event_id": "...", "seat_id": "A1", "customer_id": "..."}}
+# Response: {"id": 1, "ok": true, "result": {...}}
+#       or  {"id": 1, "ok": false, "error": "SeatUnavailableError", "message": "..."}
+#
+#   python service.py --port 8765 --snapshot data.json --journal data.journal
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from data.booking_system import BookingManager, Event, Seat
+from data.exceptions import BookingError, NotFoundError
+from data.journal import Journal
+from data.lazy import LazyStore, open_lazy
+from data.metrics import Metrics
+from data import storage
+
+log = logging.getLogger("booking.service")
+
+
+def event_summary(e: Event) -> dict:
+    return {"event_id": e.event_id, "name": e.name, "date": e.date, "location": e.location,
+            "seats": e.count_seats(), "available": e.count_available_seats()}
+
+
+def seat_to_dict(s: Seat) -> dict:
+    return {"seat_id": s.seat_id, "row": s.row, "number": s.number, "price": s.price,
+            "is_reserved": s.is_reserved}
+
+
+# -------------------------
+# Service
+# -------------------------
+# Manager calls run synchronously on the event loop thread, so state
+# transitions never interleave: every booking for an event is applied in
+# arrival order. Journal writes are taken off the loop: the change listener
+# only encodes a record, and a background task writes whole batches from a
+# worker thread (one fsync per batch when durable=True, and the affected
+# responses are sent only after that fsync).
+class BookingService:
+    def __init__(self, manager: BookingManager, journal: Optional[Journal] = None, durable: bool = False,
+                 compact_interval: float = 0, metrics: Optional[Metrics] = None, store: Optional[LazyStore] = None):
+        self.manager = manager
+        self.metrics = metrics
+        # lazily loaded sharded directory (instead of a snapshot): saved every compact_interval and on
+        # stop; the journal (opened with snapshot=None) then only keeps the records since the last save
+        self.store = store
+        self.journal = journal
+        self.durable = durable
+        self.compact_interval = compact_interval
+        self._batch: List[str] = []
+        self._batch_done: Optional[asyncio.Future] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self.ops = {
+            "ping": lambda: "pong",
+            "add_event": self.op_add_event,
+            "register_customer": self.op_register_customer,
+            "book_seat": self.op_book_seat,
+            "book_seats": self.op_book_seats,
+            "cancel_ticket": self.op_cancel_ticket,
+            "hold_seats": self.op_hold_seats,
+            "confirm_hold": self.op_confirm_hold,
+            "release_hold": self.manager.release_hold,
+            "list_events": self.op_list_events,
+            "get_available_seats": self.op_get_available_seats,
+            "get_availability": self.op_get_availability,
+            "find_best_seats": self.op_find_best_seats,
+            "list_tickets_for_customer": self.op_list_tickets_for_customer,
+            "list_tickets_for_event": self.op_list_tickets_for_event,
+            "revenue_for_event": self.manager.revenue_for_event,
+        }
+        if metrics is not None:
+            self.ops["metrics"] = self.op_metrics
+
+    # -- operations
+    def op_add_event(self, name: str, date: str, location: str, seats: List[dict]) -> dict:
+        seat_objs = [Seat(s["seat_id"], s["row"], int(s["number"]), float(s["price"])) for s in seats]
+        return event_summary(self.manager.add_event(name, date, location, seat_objs))
+
+    def op_register_customer(self, name: str, email: str) -> dict:
+        return storage.customer_to_dict(self.manager.register_customer(name, email))
+
+    def op_book_seat(self, event_id: str, seat_id: str, customer_id: str) -> dict:
+        return storage.ticket_to_dict(self.manager.book_seat(event_id, seat_id, customer_id))
+
+    def op_book_seats(self, event_id: str, seat_ids: List[str], customer_id: str) -> List[dict]:
+        return [storage.ticket_to_dict(t) for t in self.manager.book_seats(event_id, seat_ids, customer_id)]
+
+    def op_cancel_ticket(self, ticket_id: str) -> dict:
+        self.manager.cancel_ticket(ticket_id)
+        return storage.ticket_to_dict(self.manager.tickets[ticket_id])
+
+    def op_hold_seats(self, event_id: str, seat_ids: List[str], customer_id: str, ttl: float = 600.0) -> dict:
+        hold = self.manager.hold_seats(event_id, seat_ids, customer_id, ttl)
+        return {"hold_id": hold.hold_id, "event_id": hold.event_id, "seat_ids": hold.seat_ids,
+                "customer_id": hold.customer_id, "ttl": ttl}
+
+    def op_confirm_hold(self, hold_id: str) -> List[dict]:
+        return [storage.ticket_to_dict(t) for t in self.manager.confirm_hold(hold_id)]
+
+    def op_list_events(self) -> List[dict]:
+        return [event_summary(e) for e in self.manager.list_events()]
+
+    def op_get_available_seats(self, event_id: str) -> List[dict]:
+        event = self.manager.events.get(event_id)
+        if event is None:
+            raise NotFoundError("Event not found.")
+        return [seat_to_dict(s) for s in event.get_available_seats()]
+
+    def op_get_availability(self, event_id: str) -> dict:
+        event = self.manager.events.get(event_id)
+        if event is None:
+            raise NotFoundError("Event not found.")
+        return event.availability_summary()
+
+    def op_find_best_seats(self, event_id: str, count: int, min_price: float = None,
+                           max_price: float = None) -> List[dict]:
+        event = self.manager.events.get(event_id)
+        if event is None:
+            raise NotFoundError("Event not found.")
+        return [seat_to_dict(s) for s in event.find_best_seats(count, min_price, max_price)]
+
+    def op_list_tickets_for_customer(self, customer_id: str, active_only: bool = False) -> List[dict]:
+        if active_only:
+            tickets = self.manager.list_active_tickets_for_customer(customer_id)
+        else:
+            tickets = self.manager.list_tickets_for_customer(customer_id)
+        return [storage.ticket_to_dict(t) for t in tickets]
+
+    def op_list_tickets_for_event(self, event_id: str) -> List[dict]:
+        return [storage.ticket_to_dict(t) for t in self.manager.list_tickets_for_event(event_id)]
+
+    def op_metrics(self, format: str = "json") -> Any:
+        if format == "prometheus":
+            return self.metrics.to_prometheus()
+        return self.metrics.snapshot()
+
+    # -- request handling
+    async def handle_request(self, raw: bytes) -> dict:
+        try:
+            req = json.loads(raw)
+            req_id = req.get("id")
+            op = req["op"]
+            args: Dict[str, Any] = req.get("args") or {}
+        except (ValueError, KeyError, AttributeError) as e:
+            return {"id": None, "ok": False, "error": "ProtocolError", "message": f"Malformed request: {e}"}
+
+        fn = self.ops.get(op)
+        if fn is None:
+            return {"id": req_id, "ok": False, "error": "ProtocolError", "message": f"Unknown op '{op}'."}
+        try:
+            result = fn(**args)
+        except BookingError as e:
+            return {"id": req_id, "ok": False, "error": type(e).__name__, "message": str(e)}
+        except (TypeError, ValueError, KeyError) as e:
+            return {"id": req_id, "ok": False, "error": "ValidationError", "message": f"Bad arguments: {e}"}
+
+        if self.durable and self._batch:
+            # the change is queued for the journal; answer once it is on disk
+            await asyncio.shield(self._batch_done)
+        return {"id": req_id, "ok": True, "result": result}
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                response = await self.handle_request(line)
+                writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    # -- persistence
+    def _on_change(self, op: str, obj: Any):
+        line = Journal.encode(op, obj)
+        if line is not None:
+            self._batch.append(line)
+            self._wakeup.set()
+
+    async def _writer(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if not self._batch:
+                continue
+            batch, done = self._batch, self._batch_done
+            self._batch, self._batch_done = [], loop.create_future()
+            try:
+                await loop.run_in_executor(None, self.journal.write_lines, batch, self.durable)
+                done.set_result(None)
+            except Exception as e:
+                done.set_exception(e)
+                done.exception()   # mark retrieved; waiting clients get the error themselves
+
+    async def _compactor(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.compact_interval)
+            try:
+                await loop.run_in_executor(None, self.journal.compact)
+            except Exception:
+                log.exception("Journal compaction failed")
+
+    async def _saver(self):
+        # save_sharded reads each event under its lock, so it can run beside the loop
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.compact_interval)
+            try:
+                await loop.run_in_executor(None, self._save_store)
+            except Exception:
+                log.exception("Saving the shard directory failed")
+
+    def _save_store(self):
+        # journal records written before the save starts are covered by it
+        mark = self.journal.log_size if self.journal is not None else None
+        self.store.save()
+        if self.journal is not None:
+            self.journal.truncate(mark)
+
+    async def _expirer(self):
+        # releases due seat holds even when no booking traffic triggers it
+        while True:
+            await asyncio.sleep(1.0)
+            self.manager.expire_holds()
+
+    async def start(self):
+        self._tasks.append(asyncio.create_task(self._expirer()))
+        if self.store is not None and self.compact_interval:
+            self._tasks.append(asyncio.create_task(self._saver()))
+        if self.journal is not None:
+            loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+            self._batch_done = loop.create_future()
+            self.manager.add_listener(self._on_change)
+            self._tasks.append(asyncio.create_task(self._writer()))
+            if self.compact_interval and self.store is None:
+                self._tasks.append(asyncio.create_task(self._compactor()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        if self.journal is not None:
+            self.manager.remove_listener(self._on_change)
+            if self._batch:
+                self.journal.write_lines(self._batch, sync=True)
+                self._batch = []
+            if not self._batch_done.done():
+                self._batch_done.set_result(None)
+        if self.store is not None:
+            self._save_store()
+        if self.journal is not None:
+            self.journal.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765):
+        await self.start()
+        server = await asyncio.start_server(self.handle_client, host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.stop()
+
+
+# -------------------------
+# Client
+# -------------------------
+class ServiceError(BookingError):
+    def __init__(self, error: str, message: str):
+        super().__init__(f"{error}: {message}")
+        self.error = error
+
+
+class BookingClient:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self._next_id = 0
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = 8765) -> "BookingClient":
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def call(self, op: str, **args) -> Any:
+        self._next_id += 1
+        req = {"id": self._next_id, "op": op, "args": args}
+        self.writer.write(json.dumps(req, ensure_ascii=False).encode("utf-8") + b"\n")
+        await self.writer.drain()
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("Service closed the connection.")
+        resp = json.loads(line)
+        if not resp["ok"]:
+            raise ServiceError(resp["error"], resp["message"])
+        return resp["result"]
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Asyncio booking service (JSON lines over TCP)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--snapshot", default="data.json")
+    parser.add_argument("--journal", default="data.journal", help="journal file; pass '' to run without persistence")
+    parser.add_argument("--durable", action="store_true", help="answer writes only after their journal fsync")
+    parser.add_argument("--compact-interval", type=float, default=300.0, help="seconds between snapshots; 0 = never")
+    parser.add_argument("--metrics", action="store_true", help="record call/latency/error metrics ('metrics' op)")
+    parser.add_argument("--lazy", metavar="DIR", help="serve a sharded directory, loading event seats on demand "
+                                                     "(replaces --snapshot; the journal is kept in DIR)")
+    parser.add_argument("--memory-budget", type=float, default=256, help="MB of seat data kept loaded with --lazy")
+    args = parser.parse_args()
+    if args.durable and not args.journal:
+        parser.error("--durable needs a journal")
+
+    manager = BookingManager()
+    metrics = None
+    if args.metrics:
+        metrics = Metrics()
+        metrics.instrument(manager)
+        metrics.instrument_storage()
+    journal = store = None
+    if args.lazy:
+        store = open_lazy(manager, args.lazy, int(args.memory_budget * (1 << 20)))
+        if args.journal:
+            # changes since the last save of the directory are replayed on top of it
+            journal = Journal(manager, snapshot=None, log=os.path.join(args.lazy, "journal.log"), fsync_every=0)
+            journal.open(listen=False)
+    elif args.journal:
+        journal = Journal(manager, snapshot=args.snapshot, log=args.journal, fsync_every=0)
+        journal.open(listen=False)
+    service = BookingService(manager, journal, durable=args.durable, compact_interval=args.compact_interval,
+                             metrics=metrics, store=store)
+    print(f"Serving {len(manager.events)} events on {args.host}:{args.port}")
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+# data/sharding.py
+
+import multiprocessing
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from data.booking_system import BookingManager, Customer, Seat, Ticket
+from data.exceptions import BookingError, NotFoundError
+from data.ids import SnowflakeIds
+from data import storage
+
+# -------------------------
+# Shard worker
+# -------------------------
+# Each worker process owns a BookingManager holding a subset of the events
+# and a full copy of the customer registry (customers are small and needed
+# to validate bookings). Requests come in over a Pipe as (op, args) and are
+# answered with ("ok", result) or ("err", exception). A shard persists itself
+# to its own binary snapshot file.
+def _event_header(manager: BookingManager, event_id: str) -> dict:
+    e = manager.events[event_id]
+    return {"event_id": e.event_id, "name": e.name, "date": e.date, "location": e.location,
+            "seats": len(e.seats), "available": e.count_available_seats()}
+
+
+def _book_many(manager: BookingManager, bookings: List[Tuple[str, str, str]]) -> List[Any]:
+    results = []
+    for event_id, seat_id, customer_id in bookings:
+        try:
+            results.append(manager.book_seat(event_id, seat_id, customer_id))
+        except BookingError as e:
+            results.append(e)
+    return results
+
+
+def _add_customers(manager: BookingManager, customers: List[Customer]):
+    for cust in customers:
+        manager.customers[cust.customer_id] = cust
+
+
+def _shard_main(conn, index: int, filename: Optional[str]):
+    # node 0 is the coordinator; every shard gets its own node so ids never collide
+    manager = BookingManager(SnowflakeIds(node=index + 1))
+    if filename and os.path.exists(filename):
+        storage.load_from_binary(manager, filename)
+
+    ops = {
+        "add_event": lambda name, date, location, seats: manager.add_event(
+            name, date, location, [Seat(*s) for s in seats]).event_id,
+        "add_customers": lambda customers: _add_customers(manager, customers),
+        "book_seat": manager.book_seat,
+        "book_seats": manager.book_seats,
+        "book_many": lambda bookings: _book_many(manager, bookings),
+        "cancel_ticket": manager.cancel_ticket,
+        "event_header": lambda event_id: _event_header(manager, event_id),
+        "list_events": lambda: [_event_header(manager, eid) for eid in manager.events],
+        "available_seat_ids": lambda event_id: [s.seat_id for s in manager.events[event_id].get_available_seats()],
+        "list_tickets_for_customer": manager.list_tickets_for_customer,
+        "list_tickets_for_event": manager.list_tickets_for_event,
+        "revenue_for_event": manager.revenue_for_event,
+        "routing": lambda: (list(manager.events), list(manager.tickets), list(manager.customers.values())),
+        "save": lambda: storage.save_to_binary(manager, filename) if filename else None,
+    }
+    while True:
+        try:
+            op, args = conn.recv()
+        except EOFError:
+            break
+        if op == "stop":
+            conn.send(("ok", None))
+            break
+        try:
+            conn.send(("ok", ops[op](*args)))
+        except Exception as e:
+            # a bad request must not take the shard down
+            try:
+                conn.send(("err", e))
+            except Exception:
+                conn.send(("err", RuntimeError(repr(e))))
+    conn.close()
+
+
+class _Shard:
+    def __init__(self, ctx, index: int, filename: Optional[str]):
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_shard_main, args=(child, index, filename), daemon=True)
+        self.process.start()
+        child.close()
+        self.lock = threading.Lock()   # one outstanding request per shard
+
+    def send(self, op: str, *args):
+        self.conn.send((op, args))
+
+    def receive(self) -> Any:
+        status, result = self.conn.recv()
+        if status == "err":
+            raise result
+        return result
+
+    def call(self, op: str, *args) -> Any:
+        with self.lock:
+            self.send(op, *args)
+            return self.receive()
+
+
+# -------------------------
+# Shard directory
+# -------------------------
+# Events are not rehashed when the shard count changes, so a directory is
+# always reopened with the count it was written with (kept in shards.json;
+# directories without it are sized by their shard-*.bin files).
+SHARDS_FILE = "shards.json"
+_SHARD_FILE = re.compile(r"shard-(\d+)\.bin")
+
+
+def _directory_shards(directory: str, num_shards: Optional[int]) -> Optional[int]:
+    path = os.path.join(directory, SHARDS_FILE)
+    if os.path.exists(path):
+        try:
+            stored = int(storage._read_json(path)["num_shards"])
+        except (ValueError, KeyError, TypeError) as e:
+            raise RuntimeError(f"Error reading {path}: {e}")
+    else:
+        indexes = [int(m.group(1)) for m in map(_SHARD_FILE.fullmatch, os.listdir(directory)) if m]
+        stored = max(indexes) + 1 if indexes else None
+    if stored is None:
+        return num_shards
+    if num_shards is not None and num_shards != stored:
+        raise ValueError(f"{directory} holds {stored} shards; it cannot be opened with {num_shards}")
+    return stored
+
+
+# -------------------------
+# Coordinator
+# -------------------------
+# Events are independent, so they are spread over worker processes and every
+# event-scoped call is routed to the shard that owns the event; shards run in
+# parallel instead of sharing one GIL. The coordinator keeps the customer
+# registry (replicated to every shard) and the routing tables event -> shard
+# and ticket -> shard, which are rebuilt from the shard files on start.
+# Calls from different threads to different shards overlap; book_many()
+# fans a batch out to all shards at once.
+class ShardedBookingManager:
+    def __init__(self, num_shards: Optional[int] = None, directory: Optional[str] = None):
+        self.directory = directory
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            num_shards = _directory_shards(directory, num_shards)
+        self.num_shards = num_shards or os.cpu_count() or 1
+        if directory:
+            storage._atomic_write_json(os.path.join(directory, SHARDS_FILE), {"num_shards": self.num_shards})
+        ctx = multiprocessing.get_context()
+        self.shards = [_Shard(ctx, i, self.shard_file(i)) for i in range(self.num_shards)]
+        self.new_id = SnowflakeIds(node=0)
+        self.customers: Dict[str, Customer] = {}
+        self._event_shard: Dict[str, int] = {}
+        self._ticket_shard: Dict[str, int] = {}
+        self._route_lock = threading.Lock()
+        self._customer_lock = threading.Lock()
+
+        for i, shard in enumerate(self.shards):
+            event_ids, ticket_ids, customers = shard.call("routing")
+            self._event_shard.update((eid, i) for eid in event_ids)
+            self._ticket_shard.update((tid, i) for tid in ticket_ids)
+            for cust in customers:
+                self.customers.setdefault(cust.customer_id, cust)
+        if self.customers:
+            # a shard may have been written before the last customers were registered
+            for shard in self.shards:
+                shard.call("add_customers", list(self.customers.values()))
+
+    def shard_file(self, index: int) -> Optional[str]:
+        if not self.directory:
+            return None
+        return os.path.join(self.directory, f"shard-{index:03d}.bin")
+
+    def close(self, save: bool = True):
+        if save and self.directory:
+            self.save()
+        for shard in self.shards:
+            try:
+                shard.call("stop")
+            except (EOFError, OSError):
+                pass
+            shard.process.join(timeout=5)
+            shard.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def save(self):
+        # all shards write their files in parallel
+        for shard in self.shards:
+            shard.lock.acquire()
+        try:
+            for shard in self.shards:
+                shard.send("save")
+            errors = []
+            for shard in self.shards:
+                try:
+                    shard.receive()
+                except Exception as e:
+                    errors.append(e)
+            if errors:
+                raise errors[0]
+        finally:
+            for shard in self.shards:
+                shard.lock.release()
+
+    # -- routing
+    def _shard_of_event(self, event_id: str) -> _Shard:
+        index = self._event_shard.get(event_id)
+        if index is None:
+            raise NotFoundError("Event not found.")
+        return self.shards[index]
+
+    def _shard_of_ticket(self, ticket_id: str) -> _Shard:
+        index = self._ticket_shard.get(ticket_id)
+        if index is None:
+            raise NotFoundError("Ticket not found.")
+        return self.shards[index]
+
+    def _record_tickets(self, event_id: str, tickets: List[Ticket]):
+        index = self._event_shard[event_id]
+        with self._route_lock:
+            for t in tickets:
+                self._ticket_shard[t.ticket_id] = index
+
+    # -- writes
+    def add_event(self, name: str, date: str, location: str, seats: List[Seat]) -> str:
+        with self._route_lock:
+            # the shard with the fewest events gets the new one
+            counts = [0] * self.num_shards
+            for index in self._event_shard.values():
+                counts[index] += 1
+            index = counts.index(min(counts))
+        eid = self.shards[index].call("add_event", name, date, location,
+                                      [(s.seat_id, s.row, s.number, s.price) for s in seats])
+        with self._route_lock:
+            self._event_shard[eid] = index
+        return eid
+
+    def register_customer(self, name: str, email: str) -> Customer:
+        cust = Customer(customer_id=self.new_id(), name=name, email=email)
+        with self._customer_lock:
+            for shard in self.shards:
+                shard.call("add_customers", [cust])
+            self.customers[cust.customer_id] = cust
+        return cust
+
+    def book_seat(self, event_id: str, seat_id: str, customer_id: str) -> Ticket:
+        if customer_id not in self.customers:
+            raise NotFoundError("Customer not found.")
+        ticket = self._shard_of_event(event_id).call("book_seat", event_id, seat_id, customer_id)
+        self._record_tickets(event_id, [ticket])
+        return ticket
+
+    def book_seats(self, event_id: str, seat_ids: List[str], customer_id: str) -> List[Ticket]:
+        if customer_id not in self.customers:
+            raise NotFoundError("Customer not found.")
+        tickets = self._shard_of_event(event_id).call("book_seats", event_id, seat_ids, customer_id)
+        self._record_tickets(event_id, tickets)
+        return tickets
+
+    def book_many(self, bookings: List[Tuple[str, str, str]]) -> List[Any]:
+        # independent bookings (not all-or-nothing): returns a Ticket or the
+        # BookingError for each request, in request order
+        results: List[Any] = [None] * len(bookings)
+        groups: Dict[int, List[int]] = {}
+        for i, (event_id, _, customer_id) in enumerate(bookings):
+            index = self._event_shard.get(event_id)
+            if index is None:
+                results[i] = NotFoundError("Event not found.")
+            elif customer_id not in self.customers:
+                results[i] = NotFoundError("Customer not found.")
+            else:
+                groups.setdefault(index, []).append(i)
+
+        order = sorted(groups)
+        for index in order:
+            self.shards[index].lock.acquire()
+        try:
+            for index in order:
+                self.shards[index].send("book_many", [bookings[i] for i in groups[index]])
+            for index in order:
+                for i, result in zip(groups[index], self.shards[index].receive()):
+                    results[i] = result
+        finally:
+            for index in order:
+                self.shards[index].lock.release()
+
+        with self._route_lock:
+            for result in results:
+                if isinstance(result, Ticket):
+                    self._ticket_shard[result.ticket_id] = self._event_shard[result.event_id]
+        return results
+
+    def cancel_ticket(self, ticket_id: str):
+        self._shard_of_ticket(ticket_id).call("cancel_ticket", ticket_id)
+
+    # -- queries
+    def list_events(self) -> List[dict]:
+        events = []
+        for shard in self.shards:
+            events.extend(shard.call("list_events"))
+        return events
+
+    def event_header(self, event_id: str) -> dict:
+        return self._shard_of_event(event_id).call("event_header", event_id)
+
+    def get_available_seat_ids(self, event_id: str) -> List[str]:
+        return self._shard_of_event(event_id).call("available_seat_ids", event_id)
+
+    def list_tickets_for_customer(self, customer_id: str) -> List[Ticket]:
+        tickets = []
+        for shard in self.shards:
+            tickets.extend(shard.call("list_tickets_for_customer", customer_id))
+        return tickets
+
+    def list_tickets_for_event(self, event_id: str) -> List[Ticket]:
+        return self._shard_of_event(event_id).call("list_tickets_for_event", event_id)
+
+    def revenue_for_event(self, event_id: str) -> float:
+        return self._shard_of_event(event_id).call("revenue_for_event", event_id)
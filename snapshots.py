@@ -0,0 +1,163 @@
+# data/snapshots.py
+
+from dataclasses import replace
+from typing import Dict, Iterator, List
+
+from data.exceptions import NotFoundError
+from data.seat_states import SEAT_BOOKED, SEAT_FREE, SEAT_HELD
+
+# -------------------------
+# Point-in-time read views
+# -------------------------
+# BookingManager.snapshot() briefly takes every event lock, notes the current
+# change sequence number and copies only the small per-event data (revenue,
+# ticket-list lengths) plus the event / customer dicts (references, not
+# objects). Nothing per seat or per ticket is copied up front:
+#   - tickets are append-only per event and carry the sequence number they
+#     were added at; a cancellation records its own sequence number, so the
+#     status as of the snapshot is known without keeping old copies;
+#   - seat states are copy-on-write: the first change to an event's seats
+#     after the snapshot saves that event's state column as it was;
+#   - events of a lazy manager (data.lazy) that have no seats in memory are
+#     neither loaded nor pinned: their file is read when asked for, and if the
+#     event gets loaded first, copy-on-write starts from the loaded seats.
+# Tickets handed out are detached copies with the status as of the snapshot.
+# close() (or leaving the with-block) stops the copy-on-write tracking.
+class _SeatStates:
+    __slots__ = ("block", "length", "before")
+
+    def __init__(self, block):
+        self.block = block
+        self.length = len(block)
+        self.before = None
+        block.watchers.append(self.on_change)
+
+    def on_change(self, pos: int, old: int, new: int):
+        if self.before is None:
+            states = bytearray(self.block.reserved[:self.length])
+            if pos < self.length:
+                states[pos] = old
+            self.before = bytes(states)
+
+    def states(self, lock) -> bytes:
+        if self.before is None:
+            with lock:
+                if self.before is None:
+                    return bytes(self.block.reserved[:self.length])
+        return self.before
+
+    def detach(self):
+        self.block.watchers.remove(self.on_change)
+
+
+class _SavedSeats:
+    __slots__ = ("event", "loaded", "before")
+
+    def __init__(self, event):
+        self.event = event
+        self.loaded = None    # _SeatStates once the event was loaded
+        self.before = None
+        event.load_hooks.append(self.on_load)
+
+    def on_load(self, block):
+        # called under the event lock; block is None when the seats are replaced
+        if block is None:
+            self.before = self.event.saved_states()
+        else:
+            self.loaded = _SeatStates(block)
+
+    def states(self, lock) -> bytes:
+        with lock:
+            if self.loaded is None and self.before is None:
+                # still not loaded, so the file is as it was at snapshot time
+                self.before = self.event.saved_states()
+                self.event.load_hooks.remove(self.on_load)
+        if self.loaded is not None:
+            return self.loaded.states(lock)
+        return self.before
+
+    def detach(self):
+        if self.loaded is not None:
+            self.loaded.detach()
+        elif self.on_load in self.event.load_hooks:
+            self.event.load_hooks.remove(self.on_load)
+
+
+class ManagerSnapshot:
+    def __init__(self, manager):
+        self._manager = manager
+        self.closed = False
+        self.events = dict(manager.events)
+        locked = sorted(self.events.values(), key=lambda e: e.event_id)
+        for e in locked:
+            e.lock.acquire()
+        try:
+            self.version = next(manager._sequence)
+            self.customers = dict(manager.customers)
+            self._revenue = {eid: manager._revenue_by_event.get(eid, 0.0) for eid in self.events}
+            # (list, length): the per-event ticket lists only ever grow
+            self._event_tickets = {}
+            for eid in self.events:
+                tickets = manager._tickets_by_event.get(eid, [])
+                self._event_tickets[eid] = (tickets, len(tickets))
+            self._seats = {e.event_id: _SeatStates(e.seats) if getattr(e, "is_loaded", True) else _SavedSeats(e)
+                           for e in locked}
+        finally:
+            for e in locked:
+                e.lock.release()
+
+    def close(self):
+        for eid, seats in self._seats.items():
+            with self.events[eid].lock:
+                seats.detach()
+        self._seats = {}
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    # -- tickets
+    def _as_of(self, ticket):
+        if ticket.status == "cancelled" and self._manager._cancel_seq.get(ticket.ticket_id, 0) > self.version:
+            return replace(ticket, status="booked")
+        return replace(ticket)
+
+    def iter_tickets(self) -> Iterator:
+        for eid in self.events:
+            yield from self.list_tickets_for_event(eid)
+
+    def list_tickets_for_event(self, event_id: str) -> List:
+        tickets, count = self._event_tickets.get(event_id, ((), 0))
+        return [self._as_of(tickets[i]) for i in range(count)]
+
+    def list_tickets_for_customer(self, customer_id: str) -> List:
+        return [self._as_of(t) for t in list(self._manager._tickets_by_customer.get(customer_id, ()))
+                if t.seq < self.version and t.event_id in self.events]
+
+    def list_active_tickets_for_customer(self, customer_id: str) -> List:
+        return [t for t in self.list_tickets_for_customer(customer_id) if t.status == "booked"]
+
+    def revenue_for_event(self, event_id: str) -> float:
+        return self._revenue.get(event_id, 0.0)
+
+    # -- seats
+    def list_events(self) -> List:
+        return list(self.events.values())
+
+    def seat_states(self, event_id: str) -> bytes:
+        # one SEAT_FREE / SEAT_BOOKED / SEAT_HELD byte per seat, in event seat order
+        if self.closed:
+            raise RuntimeError("Snapshot is closed.")
+        seats = self._seats.get(event_id)
+        if seats is None:
+            raise NotFoundError("Event not found.")
+        return seats.states(self.events[event_id].lock)
+
+    def occupancy(self, event_id: str) -> Dict[str, int]:
+        states = self.seat_states(event_id)
+        return {"total": len(states), "booked": states.count(SEAT_BOOKED), "held": states.count(SEAT_HELD),
+                "free": states.count(SEAT_FREE)}
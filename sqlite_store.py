@@ -0,0 +1,272 @@
+# data/sqlite_store.py
+
+import sqlite3
+import threading
+from array import array
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Tuple
+
+from data.booking_system import Event, Seat, SeatBlock, Customer, Ticket, BookingManager
+from data.exceptions import SeatUnavailableError, NotFoundError, ValidationError
+from data.ids import SnowflakeIds, utc_isoformat
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    event_id TEXT PRIMARY KEY,
+    name     TEXT NOT NULL,
+    date     TEXT NOT NULL,
+    location TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS seats (
+    event_id    TEXT NOT NULL,
+    pos         INTEGER NOT NULL,
+    seat_id     TEXT NOT NULL,
+    row         TEXT NOT NULL,
+    number      INTEGER NOT NULL,
+    price       REAL NOT NULL,
+    is_reserved INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (event_id, pos)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_seats_seat_id ON seats (event_id, seat_id);
+CREATE INDEX IF NOT EXISTS idx_seats_available ON seats (event_id, pos) WHERE is_reserved = 0;
+CREATE TABLE IF NOT EXISTS customers (
+    customer_id TEXT PRIMARY KEY,
+    name        TEXT NOT NULL,
+    email       TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tickets (
+    ticket_id   TEXT PRIMARY KEY,
+    event_id    TEXT NOT NULL,
+    seat_id     TEXT NOT NULL,
+    customer_id TEXT NOT NULL,
+    price       REAL NOT NULL,
+    created_at  TEXT NOT NULL,
+    status      TEXT NOT NULL DEFAULT 'booked'
+);
+CREATE INDEX IF NOT EXISTS idx_tickets_customer ON tickets (customer_id, status);
+CREATE INDEX IF NOT EXISTS idx_tickets_event ON tickets (event_id, status);
+CREATE INDEX IF NOT EXISTS idx_tickets_seat ON tickets (event_id, seat_id);
+"""
+
+def connect(filename: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(filename, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+# -------------------------
+# SQLite-backed booking store
+# -------------------------
+# Same operations as BookingManager, but every call is a short transaction
+# against the database, so the dataset does not have to fit in memory and
+# the availability check plus reservation is atomic on disk (BEGIN IMMEDIATE),
+# also across processes sharing the file.
+class SQLiteBookingStore:
+    def __init__(self, filename: str = "data.db", id_generator: Optional[Callable[[], str]] = None):
+        self.filename = filename
+        self.new_id = id_generator or SnowflakeIds()
+        self.conn = connect(filename)
+        self._lock = threading.Lock()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    # -- create helpers
+    def add_event(self, name: str, date: str, location: str, seats: List[Seat]) -> Event:
+        eid = self.new_id()
+        with self._transaction() as db:
+            db.execute("INSERT INTO events VALUES (?, ?, ?, ?)", (eid, name, date, location))
+            db.executemany("INSERT INTO seats VALUES (?, ?, ?, ?, ?, ?, ?)",
+                           ((eid, pos, s.seat_id, s.row, s.number, s.price, int(s.is_reserved))
+                            for pos, s in enumerate(seats)))
+        return self.get_event(eid)
+
+    def register_customer(self, name: str, email: str) -> Customer:
+        cid = self.new_id()
+        with self._transaction() as db:
+            db.execute("INSERT INTO customers VALUES (?, ?, ?)", (cid, name, email))
+        return Customer(customer_id=cid, name=name, email=email)
+
+    # -- booking / cancel
+    def book_seat(self, event_id: str, seat_id: str, customer_id: str) -> Ticket:
+        return self.book_bulk([(event_id, seat_id, customer_id)])[0]
+
+    def book_seats(self, event_id: str, seat_ids: List[str], customer_id: str) -> List[Ticket]:
+        return self.book_bulk([(event_id, sid, customer_id) for sid in seat_ids])
+
+    def book_bulk(self, bookings: List[Tuple[str, str, str]]) -> List[Ticket]:
+        created_at = utc_isoformat()
+        tickets = []
+        seen = set()
+        with self._transaction() as db:
+            for event_id, seat_id, customer_id in bookings:
+                if db.execute("SELECT 1 FROM events WHERE event_id = ?", (event_id,)).fetchone() is None:
+                    raise NotFoundError("Event not found.")
+                if db.execute("SELECT 1 FROM customers WHERE customer_id = ?", (customer_id,)).fetchone() is None:
+                    raise NotFoundError("Customer not found.")
+                if (event_id, seat_id) in seen:
+                    raise ValidationError(f"Seat {seat_id} requested twice.")
+                seen.add((event_id, seat_id))
+                row = db.execute("SELECT pos, price, is_reserved FROM seats WHERE event_id = ? AND seat_id = ? "
+                                 "ORDER BY pos LIMIT 1", (event_id, seat_id)).fetchone()
+                if row is None:
+                    raise NotFoundError(f"Seat {seat_id} not found in event {event_id}.")
+                pos, price, is_reserved = row
+                if is_reserved:
+                    raise SeatUnavailableError(f"Seat {seat_id} is already reserved.")
+                db.execute("UPDATE seats SET is_reserved = 1 WHERE event_id = ? AND pos = ?", (event_id, pos))
+                tickets.append(Ticket(ticket_id=self.new_id(), event_id=event_id, seat_id=seat_id,
+                                      customer_id=customer_id, price=price, created_at=created_at))
+            db.executemany("INSERT INTO tickets VALUES (?, ?, ?, ?, ?, ?, ?)",
+                           ((t.ticket_id, t.event_id, t.seat_id, t.customer_id, t.price, t.created_at, t.status)
+                            for t in tickets))
+        return tickets
+
+    def cancel_ticket(self, ticket_id: str):
+        with self._transaction() as db:
+            row = db.execute("SELECT event_id, seat_id, status FROM tickets WHERE ticket_id = ?",
+                             (ticket_id,)).fetchone()
+            if row is None:
+                raise NotFoundError("Ticket not found.")
+            event_id, seat_id, status = row
+            if status == "cancelled":
+                raise ValidationError("Ticket already cancelled.")
+            db.execute("UPDATE seats SET is_reserved = 0 WHERE event_id = ? AND pos = "
+                       "(SELECT pos FROM seats WHERE event_id = ? AND seat_id = ? ORDER BY pos LIMIT 1)",
+                       (event_id, event_id, seat_id))
+            db.execute("UPDATE tickets SET status = 'cancelled' WHERE ticket_id = ?", (ticket_id,))
+
+    # -- queries
+    def _query(self, sql: str, params=()) -> list:
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def list_events(self) -> List[Event]:
+        # headers only; use get_event() for the seat map
+        return [Event(event_id=eid, name=name, date=date, location=location)
+                for eid, name, date, location in self._query("SELECT * FROM events")]
+
+    def get_event(self, event_id: str) -> Event:
+        rows = self._query("SELECT * FROM events WHERE event_id = ?", (event_id,))
+        if not rows:
+            raise NotFoundError("Event not found.")
+        eid, name, date, location = rows[0]
+        seats = self._query("SELECT seat_id, row, number, price, is_reserved FROM seats "
+                            "WHERE event_id = ? ORDER BY pos", (event_id,))
+        return Event(event_id=eid, name=name, date=date, location=location, seats=_seat_block(seats))
+
+    def get_available_seats(self, event_id: str) -> List[Seat]:
+        rows = self._query("SELECT seat_id, row, number, price, is_reserved FROM seats "
+                           "WHERE event_id = ? AND is_reserved = 0 ORDER BY pos", (event_id,))
+        return [Seat(*r) for r in rows]
+
+    def count_available_seats(self, event_id: str) -> int:
+        return self._query("SELECT COUNT(*) FROM seats WHERE event_id = ? AND is_reserved = 0",
+                           (event_id,))[0][0]
+
+    def get_customer(self, customer_id: str) -> Customer:
+        rows = self._query("SELECT * FROM customers WHERE customer_id = ?", (customer_id,))
+        if not rows:
+            raise NotFoundError("Customer not found.")
+        return Customer(*rows[0])
+
+    def get_ticket(self, ticket_id: str) -> Ticket:
+        rows = self._query("SELECT * FROM tickets WHERE ticket_id = ?", (ticket_id,))
+        if not rows:
+            raise NotFoundError("Ticket not found.")
+        return Ticket(*rows[0])
+
+    def list_tickets_for_customer(self, customer_id: str) -> List[Ticket]:
+        return [Ticket(*r) for r in self._query("SELECT * FROM tickets WHERE customer_id = ?", (customer_id,))]
+
+    def list_active_tickets_for_customer(self, customer_id: str) -> List[Ticket]:
+        return [Ticket(*r) for r in self._query("SELECT * FROM tickets WHERE customer_id = ? AND status = 'booked'",
+                                                (customer_id,))]
+
+    def list_tickets_for_event(self, event_id: str) -> List[Ticket]:
+        return [Ticket(*r) for r in self._query("SELECT * FROM tickets WHERE event_id = ?", (event_id,))]
+
+    def revenue_for_event(self, event_id: str) -> float:
+        return self._query("SELECT COALESCE(SUM(price), 0.0) FROM tickets WHERE event_id = ? AND status = 'booked'",
+                           (event_id,))[0][0]
+
+
+def _seat_block(rows: list) -> SeatBlock:
+    ids, seat_rows, numbers, prices, reserved = [], [], array("i"), array("d"), bytearray()
+    for sid, row, number, price, is_reserved in rows:
+        ids.append(sid)
+        seat_rows.append(row)
+        numbers.append(number)
+        prices.append(price)
+        reserved.append(1 if is_reserved else 0)
+    return SeatBlock.from_columns(ids, seat_rows, numbers, prices, reserved)
+
+# -------------------------
+# Snapshot to / from an in-memory BookingManager
+# -------------------------
+def save_to_sqlite(manager: BookingManager, filename: str = "data.db"):
+    conn = connect(filename)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        for table in ("events", "seats", "customers", "tickets"):
+            conn.execute(f"DELETE FROM {table}")
+        events = list(manager.events.values())
+        conn.executemany("INSERT INTO events VALUES (?, ?, ?, ?)",
+                         ((e.event_id, e.name, e.date, e.location) for e in events))
+        for e in events:
+            conn.executemany("INSERT INTO seats VALUES (?, ?, ?, ?, ?, ?, ?)",
+                             ((e.event_id, pos, sid, row, number, price, int(r))
+                              for pos, (sid, row, number, price, r) in enumerate(e.seats.records())))
+        conn.executemany("INSERT INTO customers VALUES (?, ?, ?)",
+                         ((c.customer_id, c.name, c.email) for c in list(manager.customers.values())))
+        conn.executemany("INSERT INTO tickets VALUES (?, ?, ?, ?, ?, ?, ?)",
+                         ((t.ticket_id, t.event_id, t.seat_id, t.customer_id, t.price, t.created_at, t.status)
+                          for t in list(manager.tickets.values())))
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+def load_from_sqlite(manager: BookingManager, filename: str = "data.db"):
+    try:
+        conn = sqlite3.connect(f"file:{filename}?mode=ro", uri=True)
+    except sqlite3.OperationalError:
+        raise FileNotFoundError(f"SQLite database '{filename}' not found.")
+
+    try:
+        events = conn.execute("SELECT * FROM events").fetchall()
+        customers = conn.execute("SELECT * FROM customers").fetchall()
+        manager.clear()
+        for eid, name, date, location in events:
+            seats = conn.execute("SELECT seat_id, row, number, price, is_reserved FROM seats "
+                                 "WHERE event_id = ? ORDER BY pos", (eid,))
+            manager.events[eid] = Event(event_id=eid, name=name, date=date, location=location,
+                                        seats=_seat_block(seats))
+        for cid, name, email in customers:
+            manager.customers[cid] = Customer(customer_id=cid, name=name, email=email)
+        for row in conn.execute("SELECT * FROM tickets"):
+            manager.add_ticket(Ticket(*row))
+    except sqlite3.DatabaseError as e:
+        raise RuntimeError(f"Error reading SQLite database: {e}")
+    finally:
+        conn.close()
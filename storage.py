@@ -1,48 +1,95 @@
 # data/storage.py
 
+import hashlib
 import json
+import os
+import re
+import struct
+import sys
 import xml.etree.ElementTree as ET
-from typing import Any
-from data.booking_system import Event, Seat, Customer, Ticket, BookingManager
+import zlib
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from data.booking_system import Event, SeatBlock, Customer, Ticket, BookingManager, SEAT_BOOKED
+
+# -------------------------
+# dict conversion (shared by JSON snapshot and journal)
+# -------------------------
+def event_to_dict(e: Event) -> dict:
+    return _event_dict(e.event_id, e.name, e.date, e.location, e.seats.records())
+
+def _event_dict(event_id: str, name: str, date: str, location: str, records) -> dict:
+    return {
+        "event_id": event_id,
+        "name": name,
+        "date": date,
+        "location": location,
+        "seats": [
+            {
+                "seat_id": sid,
+                "row": row,
+                "number": number,
+                "price": price,
+                "is_reserved": is_reserved
+            } for sid, row, number, price, is_reserved in records
+        ]
+    }
+
+def customer_to_dict(c: Customer) -> dict:
+    return {"customer_id": c.customer_id, "name": c.name, "email": c.email}
+
+def ticket_to_dict(t: Ticket) -> dict:
+    return {
+        "ticket_id": t.ticket_id,
+        "event_id": t.event_id,
+        "seat_id": t.seat_id,
+        "customer_id": t.customer_id,
+        "price": t.price,
+        "created_at": t.created_at,
+        "status": t.status
+    }
+
+def event_from_dict(e: dict) -> Event:
+    seats = SeatBlock()
+    for s in e.get("seats", []):
+        seats.append(s["seat_id"], s["row"], int(s["number"]), float(s["price"]), bool(s.get("is_reserved", False)))
+    return Event(event_id=e["event_id"], name=e["name"], date=e["date"], location=e["location"], seats=seats)
+
+def customer_from_dict(c: dict) -> Customer:
+    return Customer(customer_id=c["customer_id"], name=c["name"], email=c["email"])
+
+def ticket_from_dict(t: dict) -> Ticket:
+    return Ticket(ticket_id=t["ticket_id"],
+                  event_id=t["event_id"],
+                  seat_id=t["seat_id"],
+                  customer_id=t["customer_id"],
+                  price=float(t.get("price", 0.0)),
+                  created_at=t.get("created_at", ""),
+                  status=t.get("status", "booked"))
+
+def restore_ticket(manager: BookingManager, ticket: Ticket):
+    manager.add_ticket(ticket)
+    # mark reserved seats for booked tickets
+    if ticket.status == "booked":
+        ev = manager.events.get(ticket.event_id)
+        if ev:
+            try:
+                s = ev.find_seat(ticket.seat_id)
+                if not s.is_reserved:
+                    s.reserve()
+            except Exception:
+                pass
 
 # -------------------------
 # JSON
 # -------------------------
 def save_to_json(manager: BookingManager, filename: str = "data.json"):
     data = {
-        "events": [
-            {
-                "event_id": e.event_id,
-                "name": e.name,
-                "date": e.date,
-                "location": e.location,
-                "seats": [
-                    {
-                        "seat_id": s.seat_id,
-                        "row": s.row,
-                        "number": s.number,
-                        "price": s.price,
-                        "is_reserved": s.is_reserved
-                    } for s in e.seats
-                ]
-            } for e in manager.events.values()
-        ],
-        "customers": [
-            {"customer_id": c.customer_id, "name": c.name, "email": c.email}
-            for c in manager.customers.values()
-        ],
-        "tickets": [
-            {
-                "ticket_id": t.ticket_id,
-                "event_id": t.event_id,
-                "seat_id": t.seat_id,
-                "customer_id": t.customer_id,
-                "price": t.price,
-                "created_at": t.created_at,
-                "status": t.status
-
-            } for t in manager.tickets.values()
-        ]
+        "events": [event_to_dict(e) for e in list(manager.events.values())],
+        "customers": [customer_to_dict(c) for c in list(manager.customers.values())],
+        "tickets": [ticket_to_dict(t) for t in list(manager.tickets.values())]
     }
     with open(filename, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
@@ -57,41 +104,21 @@ def load_from_json(manager: BookingManager, filename: str = "data.json"):
         raise RuntimeError(f"Error reading JSON: {e}")
 
     # clear current
-    manager.events.clear()
-    manager.customers.clear()
-    manager.tickets.clear()
+    manager.clear()
 
     # load events
     for e in data.get("events", []):
-        seats = [Seat(s["seat_id"], s["row"], int(s["number"]), float(s["price"]), bool(s.get("is_reserved", False)))
-                 for s in e.get("seats", [])]
-        evt = Event(event_id=e["event_id"], name=e["name"], date=e["date"], location=e["location"], seats=seats)
+        evt = event_from_dict(e)
         manager.events[evt.event_id] = evt
 
     # load customers
     for c in data.get("customers", []):
-        cust = Customer(customer_id=c["customer_id"], name=c["name"], email=c["email"])
+        cust = customer_from_dict(c)
         manager.customers[cust.customer_id] = cust
 
     # load tickets
     for t in data.get("tickets", []):
-        ticket = Ticket(ticket_id=t["ticket_id"],
-                        event_id=t["event_id"],
-                        seat_id=t["seat_id"],
-                        customer_id=t["customer_id"],
-                        price=float(t.get("price", 0.0)),
-                        created_at=t.get("created_at", ""),
-                        status=t.get("status", "booked"))
-        manager.tickets[ticket.ticket_id] = ticket
-        # mark reserved seats for booked tickets
-        if ticket.status == "booked":
-            ev = manager.events.get(ticket.event_id)
-            if ev:
-                try:
-                    s = ev.find_seat(ticket.seat_id)
-                    s.is_reserved = True
-                except Exception:
-                    pass
+        restore_ticket(manager, ticket_from_dict(t))
 
 # -------------------------
 # XML
@@ -101,37 +128,77 @@ def save_to_xml(manager: BookingManager, filename: str = "data.xml"):
 
     events_el = ET.SubElement(root, "Events")
     for e in manager.events.values():
-        e_el = ET.SubElement(events_el, "Event", id=e.event_id)
-        ET.SubElement(e_el, "Name").text = e.name
-        ET.SubElement(e_el, "Date").text = e.date
-        ET.SubElement(e_el, "Location").text = e.location
-        seats_el = ET.SubElement(e_el, "Seats")
-        for s in e.seats:
-            s_el = ET.SubElement(seats_el, "Seat", id=s.seat_id)
-            ET.SubElement(s_el, "Row").text = s.row
-            ET.SubElement(s_el, "Number").text = str(s.number)
-            ET.SubElement(s_el, "Price").text = str(s.price)
-            ET.SubElement(s_el, "IsReserved").text = "True" if s.is_reserved else "False"
+        append_event_xml(events_el, e.event_id, e.name, e.date, e.location, e.seats.records())
 
-    customers_el = ET.SubElement(root, "Customers")
-    for c in manager.customers.values():
-        c_el = ET.SubElement(customers_el, "Customer", id=c.customer_id)
-        ET.SubElement(c_el, "Name").text = c.name
-        ET.SubElement(c_el, "Email").text = c.email
+    append_customers_xml(root, manager.customers.values())
 
     tickets_el = ET.SubElement(root, "Tickets")
     for t in manager.tickets.values():
-        t_el = ET.SubElement(tickets_el, "Ticket", id=t.ticket_id)
-        ET.SubElement(t_el, "EventID").text = t.event_id
-        ET.SubElement(t_el, "SeatID").text = t.seat_id
-        ET.SubElement(t_el, "CustomerID").text = t.customer_id
-        ET.SubElement(t_el, "Price").text = str(t.price)
-        ET.SubElement(t_el, "CreatedAt").text = t.created_at
-        ET.SubElement(t_el, "Status").text = t.status
+        append_ticket_xml(tickets_el, t)
 
     tree = ET.ElementTree(root)
     tree.write(filename, encoding="utf-8", xml_declaration=True)
 
+def append_event_xml(parent, event_id: str, name: str, date: str, location: str, records):
+    e_el = ET.SubElement(parent, "Event", id=event_id)
+    ET.SubElement(e_el, "Name").text = name
+    ET.SubElement(e_el, "Date").text = date
+    ET.SubElement(e_el, "Location").text = location
+    seats_el = ET.SubElement(e_el, "Seats")
+    for sid, row, number, price, is_reserved in records:
+        s_el = ET.SubElement(seats_el, "Seat", id=sid)
+        ET.SubElement(s_el, "Row").text = row
+        ET.SubElement(s_el, "Number").text = str(number)
+        ET.SubElement(s_el, "Price").text = str(price)
+        ET.SubElement(s_el, "IsReserved").text = "True" if is_reserved else "False"
+    return e_el
+
+def append_customers_xml(root, customers):
+    customers_el = ET.SubElement(root, "Customers")
+    for c in customers:
+        c_el = ET.SubElement(customers_el, "Customer", id=c.customer_id)
+        ET.SubElement(c_el, "Name").text = c.name
+        ET.SubElement(c_el, "Email").text = c.email
+    return customers_el
+
+def append_ticket_xml(parent, t: Ticket):
+    t_el = ET.SubElement(parent, "Ticket", id=t.ticket_id)
+    ET.SubElement(t_el, "EventID").text = t.event_id
+    ET.SubElement(t_el, "SeatID").text = t.seat_id
+    ET.SubElement(t_el, "CustomerID").text = t.customer_id
+    ET.SubElement(t_el, "Price").text = str(t.price)
+    ET.SubElement(t_el, "CreatedAt").text = t.created_at
+    ET.SubElement(t_el, "Status").text = t.status
+    return t_el
+
+def append_seat_from_xml(seats: SeatBlock, s_elem):
+    seats.append(s_elem.attrib.get("id", ""),
+                 s_elem.findtext("Row") or "",
+                 int(s_elem.findtext("Number") or 0),
+                 float(s_elem.findtext("Price") or 0.0),
+                 s_elem.findtext("IsReserved") == "True")
+
+def customer_from_xml(c_elem) -> Customer:
+    return Customer(customer_id=c_elem.attrib.get("id", ""),
+                    name=c_elem.findtext("Name") or "",
+                    email=c_elem.findtext("Email") or "")
+
+def ticket_from_xml(t_elem) -> Ticket:
+    return Ticket(ticket_id=t_elem.attrib.get("id", ""),
+                  event_id=t_elem.findtext("EventID") or "",
+                  seat_id=t_elem.findtext("SeatID") or "",
+                  customer_id=t_elem.findtext("CustomerID") or "",
+                  price=float(t_elem.findtext("Price") or 0.0),
+                  created_at=t_elem.findtext("CreatedAt") or "",
+                  status=t_elem.findtext("Status") or "booked")
+
+def event_from_xml(e_elem, seats: SeatBlock) -> Event:
+    return Event(event_id=e_elem.attrib.get("id", ""),
+                 name=e_elem.findtext("Name") or "",
+                 date=e_elem.findtext("Date") or "",
+                 location=e_elem.findtext("Location") or "",
+                 seats=seats)
+
 def load_from_xml(manager: BookingManager, filename: str = "data.xml"):
     try:
         tree = ET.parse(filename)
@@ -142,58 +209,750 @@ def load_from_xml(manager: BookingManager, filename: str = "data.xml"):
         raise RuntimeError(f"Error reading XML: {e}")
 
     # clear
-    manager.events.clear()
-    manager.customers.clear()
-    manager.tickets.clear()
+    manager.clear()
 
     # events
     events_parent = root.find("Events")
     if events_parent is not None:
         for e_elem in events_parent.findall("Event"):
-            ev_id = e_elem.attrib.get("id", "")
-            name = e_elem.findtext("Name") or ""
-            date = e_elem.findtext("Date") or ""
-            location = e_elem.findtext("Location") or ""
-            seats = []
             seats_parent = e_elem.find("Seats")
+            seats = SeatBlock()
             if seats_parent is not None:
                 for s_elem in seats_parent.findall("Seat"):
-                    sid = s_elem.attrib.get("id", "")
-                    row = s_elem.findtext("Row") or ""
-                    number = int(s_elem.findtext("Number") or 0)
-                    price = float(s_elem.findtext("Price") or 0.0)
-                    is_reserved = (s_elem.findtext("IsReserved") == "True")
-                    seats.append(Seat(seat_id=sid, row=row, number=number, price=price, is_reserved=is_reserved))
-            evt = Event(event_id=ev_id, name=name, date=date, location=location, seats=seats)
+                    append_seat_from_xml(seats, s_elem)
+            evt = event_from_xml(e_elem, seats)
             manager.events[evt.event_id] = evt
 
     # customers
     cust_parent = root.find("Customers")
     if cust_parent is not None:
         for c_elem in cust_parent.findall("Customer"):
-            cid = c_elem.attrib.get("id", "")
-            name = c_elem.findtext("Name") or ""
-            email = c_elem.findtext("Email") or ""
-            manager.customers[cid] = Customer(customer_id=cid, name=name, email=email)
+            cust = customer_from_xml(c_elem)
+            manager.customers[cust.customer_id] = cust
 
     # tickets
     tickets_parent = root.find("Tickets")
     if tickets_parent is not None:
         for t_elem in tickets_parent.findall("Ticket"):
-            tid = t_elem.attrib.get("id", "")
-            event_id = t_elem.findtext("EventID") or ""
-            seat_id = t_elem.findtext("SeatID") or ""
-            customer_id = t_elem.findtext("CustomerID") or ""
-            price = float(t_elem.findtext("Price") or 0.0)
-            created_at = t_elem.findtext("CreatedAt") or ""
-            status = t_elem.findtext("Status") or "booked"
-            manager.tickets[tid] = Ticket(ticket_id=tid, event_id=event_id, seat_id=seat_id,
-                                          customer_id=customer_id, price=price, created_at=created_at, status=status)
-            if status == "booked":
-                ev = manager.events.get(event_id)
-                if ev:
-                    try:
-                        s = ev.find_seat(seat_id)
-                        s.is_reserved = True
-                    except Exception:
-                        pass
+            restore_ticket(manager, ticket_from_xml(t_elem))
+
+# -------------------------
+# Streaming loaders
+# -------------------------
+# Same file layouts as load_from_json / load_from_xml, but records are turned
+# into objects as they are parsed and the parsed document is discarded right
+# away, so peak memory is the object graph plus the largest single event
+# instead of the whole document. The manager is cleared before parsing starts,
+# so a corrupt file leaves it partially loaded.
+def _iter_json_arrays(f, chunk_size: int) -> Iterator[Tuple[str, Any]]:
+    # yields (key, item) for every item of every top-level array in {"key": [item, ...], ...}
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+
+    def fill(min_size: int = chunk_size) -> bool:
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        chunk = f.read(max(chunk_size, min_size))
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip_ws():
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buf) or not fill():
+                return
+
+    def expect(chars: str) -> str:
+        skip_ws()
+        if pos >= len(buf) or buf[pos] not in chars:
+            raise ValueError(f"expected one of {chars!r} at offset {pos}")
+        return buf[pos]
+
+    def decode():
+        nonlocal pos
+        want = chunk_size
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+                # a number or literal may continue past the end of the buffer
+                if end < len(buf) or eof:
+                    pos = end
+                    return value
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            # grow reads geometrically so a huge item is not re-parsed once per chunk
+            want *= 2
+            fill(want)
+
+    expect("{")
+    pos += 1
+    if expect('}"') == "}":
+        return
+    while True:
+        skip_ws()
+        key = decode()
+        expect(":")
+        pos += 1
+        if expect('[{"-0123456789tfn') == "[":
+            pos += 1
+            if expect(']{["-0123456789tfn') != "]":
+                while True:
+                    skip_ws()
+                    yield key, decode()
+                    if expect(",]") == "]":
+                        break
+                    pos += 1
+            pos += 1
+        else:
+            decode()
+        if expect(",}") == "}":
+            return
+        pos += 1
+
+def load_from_json_stream(manager: BookingManager, filename: str = "data.json", chunk_size: int = 1 << 16):
+    try:
+        f = open(filename, "r", encoding="utf-8")
+    except FileNotFoundError:
+        raise FileNotFoundError(f"JSON file '{filename}' not found.")
+
+    manager.clear()
+    with f:
+        try:
+            for key, item in _iter_json_arrays(f, chunk_size):
+                if key == "events":
+                    evt = event_from_dict(item)
+                    manager.events[evt.event_id] = evt
+                elif key == "customers":
+                    cust = customer_from_dict(item)
+                    manager.customers[cust.customer_id] = cust
+                elif key == "tickets":
+                    restore_ticket(manager, ticket_from_dict(item))
+        except (ValueError, KeyError) as e:
+            raise RuntimeError(f"Error reading JSON: {e}")
+
+def load_from_xml_stream(manager: BookingManager, filename: str = "data.xml"):
+    try:
+        context = ET.iterparse(filename, events=("start", "end"))
+    except FileNotFoundError:
+        raise FileNotFoundError(f"XML file '{filename}' not found.")
+
+    manager.clear()
+    stack = []
+    seats = SeatBlock()
+    try:
+        for ev, elem in context:
+            if ev == "start":
+                stack.append(elem)
+                if elem.tag == "Event":
+                    seats = SeatBlock()
+                continue
+            stack.pop()
+            parent = stack[-1] if stack else None
+            if elem.tag == "Seat" and parent is not None and parent.tag == "Seats":
+                append_seat_from_xml(seats, elem)
+            elif elem.tag == "Event":
+                evt = event_from_xml(elem, seats)
+                manager.events[evt.event_id] = evt
+                seats = SeatBlock()
+            elif elem.tag == "Customer":
+                cust = customer_from_xml(elem)
+                manager.customers[cust.customer_id] = cust
+            elif elem.tag == "Ticket":
+                restore_ticket(manager, ticket_from_xml(elem))
+            else:
+                continue
+            # drop the finished record from its container so the tree never grows
+            if parent is not None:
+                parent.remove(elem)
+    except ET.ParseError as e:
+        raise RuntimeError(f"Error reading XML: {e}")
+
+# -------------------------
+# Binary snapshot
+# -------------------------
+# Layout: MAGIC, u16 version, then columns in a fixed order. A string column
+# is u32 count + u64 byte length + the strings joined by NUL in UTF-8; a
+# numeric column is u32 count + the raw little-endian array. All seats of all
+# events are stored as one set of columns, split again by per-event counts.
+BINARY_MAGIC = b"BOOKSNAP"
+BINARY_VERSION = 1
+
+def _pack_strings(out: list, values: list):
+    blob = "\0".join(values)
+    if blob.count("\0") != max(len(values) - 1, 0):
+        raise ValueError("Strings in a binary snapshot must not contain NUL characters.")
+    data = blob.encode("utf-8")
+    out.append(struct.pack("<IQ", len(values), len(data)))
+    out.append(data)
+
+def _pack_array(out: list, values: array):
+    if sys.byteorder == "big" and values.itemsize > 1:
+        values = array(values.typecode, values)
+        values.byteswap()
+    out.append(struct.pack("<I", len(values)))
+    out.append(values.tobytes())
+
+class _BinaryReader:
+    def __init__(self, data: bytes):
+        self.data = memoryview(data)
+        self.pos = 0
+
+    def unpack(self, fmt: str):
+        values = struct.unpack_from(fmt, self.data, self.pos)
+        self.pos += struct.calcsize(fmt)
+        return values
+
+    def strings(self) -> list:
+        count, size = self.unpack("<IQ")
+        blob = bytes(self.data[self.pos:self.pos + size]).decode("utf-8")
+        self.pos += size
+        values = blob.split("\0") if count else []
+        if len(values) != count:
+            raise ValueError("string column is corrupt")
+        return values
+
+    def array(self, typecode: str):
+        (count,) = self.unpack("<I")
+        values = array(typecode)
+        size = count * values.itemsize
+        values.frombytes(self.data[self.pos:self.pos + size])
+        self.pos += size
+        if len(values) != count:
+            raise ValueError("numeric column is truncated")
+        if sys.byteorder == "big" and values.itemsize > 1:
+            values.byteswap()
+        return values
+
+def save_to_binary(manager: BookingManager, filename: str = "data.bin"):
+    events = list(manager.events.values())
+    customers = list(manager.customers.values())
+    tickets = list(manager.tickets.values())
+
+    out = [BINARY_MAGIC, struct.pack("<H", BINARY_VERSION)]
+    _pack_strings(out, [e.event_id for e in events])
+    _pack_strings(out, [e.name for e in events])
+    _pack_strings(out, [e.date for e in events])
+    _pack_strings(out, [e.location for e in events])
+    _pack_array(out, array("I", [len(e.seats) for e in events]))
+
+    seat_ids, rows, numbers, prices, reserved = [], [], array("i"), array("d"), bytearray()
+    for e in events:
+        seat_ids.extend(e.seats.ids)
+        rows.extend(e.seats.rows)
+        numbers.extend(e.seats.numbers)
+        prices.extend(e.seats.prices)
+        reserved.extend(e.seats.persisted_states())
+    _pack_strings(out, seat_ids)
+    _pack_strings(out, rows)
+    _pack_array(out, numbers)
+    _pack_array(out, prices)
+    _pack_array(out, array("B", reserved))
+
+    _pack_strings(out, [c.customer_id for c in customers])
+    _pack_strings(out, [c.name for c in customers])
+    _pack_strings(out, [c.email for c in customers])
+
+    _pack_strings(out, [t.ticket_id for t in tickets])
+    _pack_strings(out, [t.event_id for t in tickets])
+    _pack_strings(out, [t.seat_id for t in tickets])
+    _pack_strings(out, [t.customer_id for t in tickets])
+    _pack_array(out, array("d", [t.price for t in tickets]))
+    _pack_strings(out, [t.created_at for t in tickets])
+    _pack_strings(out, [t.status for t in tickets])
+
+    with open(filename, "wb") as f:
+        f.write(b"".join(out))
+
+def load_from_binary(manager: BookingManager, filename: str = "data.bin"):
+    try:
+        with open(filename, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Binary snapshot '{filename}' not found.")
+
+    try:
+        if data[:len(BINARY_MAGIC)] != BINARY_MAGIC:
+            raise ValueError("not a booking snapshot")
+        r = _BinaryReader(data)
+        r.pos = len(BINARY_MAGIC)
+        (version,) = r.unpack("<H")
+        if version != BINARY_VERSION:
+            raise ValueError(f"unsupported snapshot version {version}")
+
+        event_ids, names, dates, locations = r.strings(), r.strings(), r.strings(), r.strings()
+        seat_counts = r.array("I")
+        seat_ids, rows = r.strings(), r.strings()
+        numbers, prices, reserved = r.array("i"), r.array("d"), bytearray(r.array("B"))
+
+        customer_ids, customer_names, emails = r.strings(), r.strings(), r.strings()
+
+        ticket_ids, t_events, t_seats, t_customers = r.strings(), r.strings(), r.strings(), r.strings()
+        t_prices = r.array("d")
+        created, statuses = r.strings(), r.strings()
+    except (ValueError, struct.error, UnicodeDecodeError) as e:
+        raise RuntimeError(f"Error reading binary snapshot: {e}")
+
+    manager.clear()
+
+    start = 0
+    for eid, name, date, location, count in zip(event_ids, names, dates, locations, seat_counts):
+        end = start + count
+        seats = SeatBlock.from_columns(seat_ids[start:end], rows[start:end], numbers[start:end],
+                                       prices[start:end], reserved[start:end])
+        manager.events[eid] = Event(event_id=eid, name=name, date=date, location=location, seats=seats)
+        start = end
+
+    for cid, name, email in zip(customer_ids, customer_names, emails):
+        manager.customers[cid] = Customer(customer_id=cid, name=name, email=email)
+
+    # seat flags were saved together with the tickets, so there is nothing to re-mark
+    add_ticket = manager.add_ticket
+    for fields in zip(ticket_ids, t_events, t_seats, t_customers, t_prices, created, statuses):
+        add_ticket(Ticket(*fields))
+
+# -------------------------
+# Sharded directory with incremental saves
+# -------------------------
+# directory/
+#   manifest.json          event order with headers (id, file, name, date, location, free seats,
+#                          total seats),
+#                          ticket shard names, customer bucket count
+#   events/<id>.json       one event with its seats
+#   tickets/<id>.json      all tickets of one event
+#   customers/<n>.json     customers hashed into a fixed number of buckets
+#
+# save_sharded() rewrites only the shards touched since the last save or load
+# (BookingManager.take_dirty), each one via temp file + fsync + rename, and the
+# manifest last. After a clear()/reload everything is rewritten once and shard
+# files that are no longer referenced are removed.
+SHARD_FORMAT_VERSION = 1
+_SAFE_ID = re.compile(r"[A-Za-z0-9_-]{1,100}")
+
+def _shard_name(entity_id: str) -> str:
+    if _SAFE_ID.fullmatch(entity_id):
+        return entity_id + ".json"
+    return hashlib.sha1(entity_id.encode("utf-8")).hexdigest() + ".json"
+
+def _customer_bucket(customer_id: str, buckets: int) -> str:
+    return f"{zlib.crc32(customer_id.encode('utf-8')) % buckets:05d}.json"
+
+def _atomic_write_json(path: str, data: Any) -> int:
+    # returns the number of bytes written
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return len(payload)
+
+def _read_json(path: str, stats: Optional[Dict[str, int]] = None) -> Any:
+    with open(path, "rb") as f:
+        if stats is not None:
+            stats["bytes"] = stats.get("bytes", 0) + os.fstat(f.fileno()).st_size
+        return json.load(f)
+
+def save_sharded(manager: BookingManager, directory: str = "data_shards", customer_buckets: int = 64,
+                 stats: Optional[Dict[str, int]] = None) -> int:
+    # returns the number of shard files written; stats["bytes"] (if given) grows by the bytes written
+    manifest_path = os.path.join(directory, "manifest.json")
+    if os.path.exists(manifest_path):
+        customer_buckets = _read_json(manifest_path).get("customer_buckets", customer_buckets)
+    for sub in ("events", "tickets", "customers"):
+        os.makedirs(os.path.join(directory, sub), exist_ok=True)
+
+    dirty = manager.take_dirty()
+    try:
+        full = dirty[0] or not os.path.exists(manifest_path)
+        written = nbytes = 0
+
+        events = list(manager.events.values())
+        event_ids = [e.event_id for e in events] if full else [eid for eid in dirty[1] if eid in manager.events]
+        if full:
+            ticket_ids = list(dict.fromkeys(t.event_id for t in list(manager.tickets.values())))
+        else:
+            ticket_ids = list(dict.fromkeys(manager.tickets[tid].event_id for tid in dirty[3] if tid in manager.tickets))
+        # an event's seats and tickets are read together under its lock, so a save
+        # running beside bookings (e.g. from a worker thread) writes matching files
+        event_set, ticket_set = set(event_ids), set(ticket_ids)
+        by_event: Dict[str, list] = {}
+        for eid in dict.fromkeys(event_ids + ticket_ids):
+            event = manager.events.get(eid)
+            with event.lock if event else manager._orphan_lock:
+                if eid in event_set:
+                    event_data = event_to_dict(event)
+                if eid in ticket_set:
+                    by_event[eid] = [ticket_to_dict(t) for t in manager._tickets_by_event.get(eid, ())]
+            if eid in event_set:
+                nbytes += _atomic_write_json(os.path.join(directory, "events", _shard_name(eid)), event_data)
+                written += 1
+            if eid in by_event:
+                nbytes += _atomic_write_json(os.path.join(directory, "tickets", _shard_name(eid)), by_event[eid])
+                written += 1
+
+        buckets: Dict[str, Dict[str, dict]] = {}
+        customer_ids = list(manager.customers) if full else [cid for cid in dirty[2] if cid in manager.customers]
+        for cid in customer_ids:
+            name = _customer_bucket(cid, customer_buckets)
+            if name not in buckets:
+                path = os.path.join(directory, "customers", name)
+                # customers never change once registered, so an incremental save merges into the bucket
+                buckets[name] = {} if full or not os.path.exists(path) else \
+                    {c["customer_id"]: c for c in _read_json(path)}
+            buckets[name][cid] = customer_to_dict(manager.customers[cid])
+        for name, customers in buckets.items():
+            nbytes += _atomic_write_json(os.path.join(directory, "customers", name), list(customers.values()))
+            written += 1
+
+        if full:
+            ticket_event_ids = list(by_event)
+        else:
+            old = _read_json(manifest_path)
+            ticket_event_ids = list(dict.fromkeys([eid for eid, _ in old.get("tickets", [])] + list(by_event)))
+        manifest = {
+            "format": "booking-shards",
+            "version": SHARD_FORMAT_VERSION,
+            "customer_buckets": customer_buckets,
+            # headers let data.lazy open the directory without reading the event files
+            "events": [[e.event_id, _shard_name(e.event_id), e.name, e.date, e.location, e.count_available_seats(),
+                        e.count_seats()] for e in events],
+            "tickets": [[eid, _shard_name(eid)] for eid in ticket_event_ids],
+        }
+        nbytes += _atomic_write_json(manifest_path, manifest)
+        written += 1
+
+        if full:
+            # drop shards of events / buckets that no longer exist
+            keep = {
+                "events": {entry[1] for entry in manifest["events"]},
+                "tickets": {name for _, name in manifest["tickets"]},
+                "customers": set(buckets),
+            }
+            for sub, names in keep.items():
+                for name in os.listdir(os.path.join(directory, sub)):
+                    if name not in names:
+                        os.remove(os.path.join(directory, sub, name))
+    except BaseException:
+        manager.restore_dirty(dirty)
+        raise
+    if stats is not None:
+        stats["bytes"] = stats.get("bytes", 0) + nbytes
+    return written
+
+def read_shard_manifest(directory: str, stats: Optional[Dict[str, int]] = None) -> dict:
+    manifest_path = os.path.join(directory, "manifest.json")
+    try:
+        manifest = _read_json(manifest_path, stats)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Shard manifest '{manifest_path}' not found.")
+    except ValueError as e:
+        raise RuntimeError(f"Error reading shard manifest: {e}")
+    if manifest.get("version") != SHARD_FORMAT_VERSION:
+        raise RuntimeError(f"Unsupported shard format version {manifest.get('version')}")
+    return manifest
+
+def load_shard_customers(manager: BookingManager, directory: str, stats: Optional[Dict[str, int]] = None):
+    customers_dir = os.path.join(directory, "customers")
+    for name in sorted(os.listdir(customers_dir)) if os.path.isdir(customers_dir) else []:
+        if name.endswith(".json"):
+            for c in _read_json(os.path.join(customers_dir, name), stats):
+                cust = customer_from_dict(c)
+                manager.customers[cust.customer_id] = cust
+
+def iter_shard_tickets(directory: str, manifest: dict, stats: Optional[Dict[str, int]] = None) -> Iterator[Ticket]:
+    for _, name in manifest.get("tickets", []):
+        for t in _read_json(os.path.join(directory, "tickets", name), stats):
+            yield ticket_from_dict(t)
+
+def load_from_sharded(manager: BookingManager, directory: str = "data_shards",
+                      stats: Optional[Dict[str, int]] = None):
+    # stats["bytes"] (if given) grows by the size of every file read
+    manifest = read_shard_manifest(directory, stats)
+    try:
+        manager.clear()
+        for entry in manifest.get("events", []):
+            evt = event_from_dict(_read_json(os.path.join(directory, "events", entry[1]), stats))
+            manager.events[evt.event_id] = evt
+        load_shard_customers(manager, directory, stats)
+        for ticket in iter_shard_tickets(directory, manifest, stats):
+            restore_ticket(manager, ticket)
+    except (OSError, ValueError, KeyError) as e:
+        raise RuntimeError(f"Error reading shards: {e}")
+    manager.mark_clean()
+
+# -------------------------
+# Parallel export / import
+# -------------------------
+# Per-event pieces of the JSON / XML documents are serialized or parsed in a
+# process pool. Pieces go through the same builders as save_to_json /
+# save_to_xml and are spliced the way json.dump(indent=2) and
+# ElementTree.write lay out the whole document, so the parallel savers write
+# byte-identical files. Workers get plain seat columns (no Event objects) on
+# save, and byte ranges of the file (found with a cheap scan for element /
+# item starts) on load.
+XML_DECLARATION = b"<?xml version='1.0' encoding='utf-8'?>\n"
+_JSON_ITEM_START = re.compile(rb"\n    \{\n")
+_XML_EVENT_START = re.compile(rb"<Event[\s>/]")
+_XML_TICKET_START = re.compile(rb"<Ticket[\s>/]")
+
+def _event_columns(e: Event) -> tuple:
+    seats = e.seats
+    return (e.event_id, e.name, e.date, e.location,
+            seats.ids, seats.rows, seats.numbers, seats.prices, bytes(seats.persisted_states()))
+
+def _column_records(columns: tuple):
+    _, _, _, _, ids, rows, numbers, prices, states = columns
+    return zip(ids, rows, numbers, prices, (state == SEAT_BOOKED for state in states))
+
+def _split_weighted(items: list, weights: List[int], parts: int) -> List[list]:
+    # consecutive runs of items with roughly equal total weight
+    target = max(1, sum(weights) // max(1, parts))
+    chunks, current, acc = [], [], 0
+    for item, w in zip(items, weights):
+        current.append(item)
+        acc += w
+        if acc >= target:
+            chunks.append(current)
+            current, acc = [], 0
+    if current:
+        chunks.append(current)
+    return chunks
+
+def _split_ranges(starts: List[int], end: int, parts: int) -> List[Tuple[int, int]]:
+    # cuts [starts[0], end) at item starts into about `parts` ranges of similar size
+    if not starts:
+        return []
+    step = max(1, (end - starts[0]) // max(1, parts))
+    cuts = [starts[0]]
+    while True:
+        i = bisect_left(starts, cuts[-1] + step)
+        if i >= len(starts):
+            break
+        cuts.append(starts[i])
+    cuts.append(end)
+    return list(zip(cuts, cuts[1:]))
+
+def _read_range(filename: str, start: int, end: int) -> bytes:
+    with open(filename, "rb") as f:
+        f.seek(start)
+        return f.read(end - start)
+
+def _map_ranges(pool, fn, filename: str, ranges: List[Tuple[int, int]]):
+    return pool.map(fn, [filename] * len(ranges), [r[0] for r in ranges], [r[1] for r in ranges])
+
+def _ticket_fields(t: Ticket) -> tuple:
+    return (t.ticket_id, t.event_id, t.seat_id, t.customer_id, t.price, t.created_at, t.status)
+
+# -- JSON
+def _json_item(value: Any) -> str:
+    # one array item as json.dump(indent=2) lays it out at depth 2
+    return "    " + json.dumps(value, ensure_ascii=False, indent=2).replace("\n", "\n    ")
+
+def _json_events_chunk(chunk: List[tuple]) -> str:
+    return ",\n".join(_json_item(_event_dict(c[0], c[1], c[2], c[3], _column_records(c))) for c in chunk)
+
+def _json_tickets_chunk(chunk: List[tuple]) -> str:
+    return ",\n".join(_json_item(ticket_to_dict(Ticket(*fields))) for fields in chunk)
+
+def _write_json_array(f, key: str, pieces):
+    f.write(f'  "{key}": ')
+    first = True
+    for piece in pieces:
+        if not piece:
+            continue
+        f.write("[\n" if first else ",\n")
+        f.write(piece)
+        first = False
+    f.write("[]" if first else "\n  ]")
+
+def save_to_json_parallel(manager: BookingManager, filename: str = "data.json", workers: Optional[int] = None):
+    events = [_event_columns(e) for e in list(manager.events.values())]
+    customers = [customer_to_dict(c) for c in list(manager.customers.values())]
+    tickets = [_ticket_fields(t) for t in list(manager.tickets.values())]
+    workers = workers or os.cpu_count() or 1
+    event_chunks = _split_weighted(events, [len(c[4]) + 1 for c in events], workers * 4)
+    ticket_chunks = _split_weighted(tickets, [1] * len(tickets), workers * 4)
+    with ProcessPoolExecutor(workers) as pool:
+        event_pieces = pool.map(_json_events_chunk, event_chunks)
+        ticket_pieces = pool.map(_json_tickets_chunk, ticket_chunks)
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write("{\n")
+            _write_json_array(f, "events", event_pieces)
+            f.write(",\n")
+            _write_json_array(f, "customers", [",\n".join(_json_item(c) for c in customers)])
+            f.write(",\n")
+            _write_json_array(f, "tickets", ticket_pieces)
+            f.write("\n}")
+
+def _json_events_range(filename: str, start: int, end: int) -> List[tuple]:
+    items = json.loads(b"[" + _read_range(filename, start, end).strip().rstrip(b",") + b"]")
+    result = []
+    for item in items:
+        seats = event_from_dict(item).seats
+        result.append((item["event_id"], item["name"], item["date"], item["location"],
+                       seats.ids, seats.rows, seats.numbers, seats.prices, seats.reserved))
+    return result
+
+def _add_event_columns(manager: BookingManager, columns: tuple):
+    eid, name, date, location, ids, rows, numbers, prices, reserved = columns
+    manager.events[eid] = Event(event_id=eid, name=name, date=date, location=location,
+                                seats=SeatBlock.from_columns(ids, rows, numbers, prices, reserved))
+
+def load_from_json_parallel(manager: BookingManager, filename: str = "data.json", workers: Optional[int] = None):
+    # splits files laid out by save_to_json; anything else goes to load_from_json
+    try:
+        with open(filename, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"JSON file '{filename}' not found.")
+    head = b'{\n  "events": ['
+    if not data.startswith(head):
+        return load_from_json(manager, filename)
+    if data.startswith(b"]", len(head)):
+        events_end, rest_start = len(head), len(head) + 1
+    else:
+        events_end = data.find(b"\n  ]", len(head))
+        if events_end < 0:
+            return load_from_json(manager, filename)
+        rest_start = events_end + 4
+
+    # event items start at depth 2; deeper lines are indented further and strings hold no raw newlines
+    starts = [m.start() for m in _JSON_ITEM_START.finditer(data, len(head) - 1, events_end)]
+    try:
+        rest = json.loads(b'{"events": []' + data[rest_start:])
+    except Exception as e:
+        raise RuntimeError(f"Error reading JSON: {e}")
+    del data
+
+    workers = workers or os.cpu_count() or 1
+    manager.clear()
+    with ProcessPoolExecutor(workers) as pool:
+        try:
+            for chunk in _map_ranges(pool, _json_events_range, filename, _split_ranges(starts, events_end, workers * 4)):
+                for columns in chunk:
+                    _add_event_columns(manager, columns)
+        except Exception as e:
+            raise RuntimeError(f"Error reading JSON: {e}")
+
+    for c in rest.get("customers", []):
+        cust = customer_from_dict(c)
+        manager.customers[cust.customer_id] = cust
+    for t in rest.get("tickets", []):
+        restore_ticket(manager, ticket_from_dict(t))
+
+# -- XML
+def _xml_events_chunk(chunk: List[tuple]) -> bytes:
+    parent = ET.Element("Events")
+    return b"".join(ET.tostring(append_event_xml(parent, c[0], c[1], c[2], c[3], _column_records(c)), encoding="utf-8")
+                    for c in chunk)
+
+def _xml_tickets_chunk(chunk: List[tuple]) -> bytes:
+    parent = ET.Element("Tickets")
+    return b"".join(ET.tostring(append_ticket_xml(parent, Ticket(*fields)), encoding="utf-8") for fields in chunk)
+
+def _write_xml_section(f, tag: bytes, pieces):
+    first = True
+    for piece in pieces:
+        if not piece:
+            continue
+        if first:
+            f.write(b"<" + tag + b">")
+            first = False
+        f.write(piece)
+    f.write(b"<" + tag + b" />" if first else b"</" + tag + b">")
+
+def save_to_xml_parallel(manager: BookingManager, filename: str = "data.xml", workers: Optional[int] = None):
+    events = [_event_columns(e) for e in list(manager.events.values())]
+    tickets = [_ticket_fields(t) for t in list(manager.tickets.values())]
+    customers_xml = ET.tostring(append_customers_xml(ET.Element("BookingSystem"), list(manager.customers.values())),
+                                encoding="utf-8")
+    workers = workers or os.cpu_count() or 1
+    event_chunks = _split_weighted(events, [len(c[4]) + 1 for c in events], workers * 4)
+    ticket_chunks = _split_weighted(tickets, [1] * len(tickets), workers * 4)
+    with ProcessPoolExecutor(workers) as pool:
+        event_pieces = pool.map(_xml_events_chunk, event_chunks)
+        ticket_pieces = pool.map(_xml_tickets_chunk, ticket_chunks)
+        with open(filename, "wb") as f:
+            f.write(XML_DECLARATION + b"<BookingSystem>")
+            _write_xml_section(f, b"Events", event_pieces)
+            f.write(customers_xml)
+            _write_xml_section(f, b"Tickets", ticket_pieces)
+            f.write(b"</BookingSystem>")
+
+def _xml_section(data: bytes, tag: bytes) -> Tuple[int, int]:
+    # byte range of the children of <tag>...</tag>; empty when the element is absent or empty
+    start = data.find(b"<" + tag + b">")
+    if start < 0:
+        return 0, 0
+    start += len(tag) + 2
+    end = data.find(b"</" + tag + b">", start)
+    if end < 0:
+        raise RuntimeError(f"Error reading XML: unterminated <{tag.decode()}>")
+    return start, end
+
+def _xml_events_range(filename: str, start: int, end: int) -> List[tuple]:
+    result = []
+    for e_elem in ET.fromstring(b"<Events>" + _read_range(filename, start, end) + b"</Events>"):
+        seats = SeatBlock()
+        seats_parent = e_elem.find("Seats")
+        if seats_parent is not None:
+            for s_elem in seats_parent.findall("Seat"):
+                append_seat_from_xml(seats, s_elem)
+        result.append((e_elem.attrib.get("id", ""), e_elem.findtext("Name") or "", e_elem.findtext("Date") or "",
+                       e_elem.findtext("Location") or "",
+                       seats.ids, seats.rows, seats.numbers, seats.prices, seats.reserved))
+    return result
+
+def _xml_tickets_range(filename: str, start: int, end: int) -> List[Ticket]:
+    root = ET.fromstring(b"<Tickets>" + _read_range(filename, start, end) + b"</Tickets>")
+    return [ticket_from_xml(t_elem) for t_elem in root.findall("Ticket")]
+
+def load_from_xml_parallel(manager: BookingManager, filename: str = "data.xml", workers: Optional[int] = None):
+    try:
+        with open(filename, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"XML file '{filename}' not found.")
+
+    # <Event> / <Ticket> never nest and '<' is always escaped in text, so element starts are tag matches
+    ev_start, ev_end = _xml_section(data, b"Events")
+    event_starts = [m.start() for m in _XML_EVENT_START.finditer(data, ev_start, ev_end)]
+    tk_start, tk_end = _xml_section(data, b"Tickets")
+    ticket_starts = [m.start() for m in _XML_TICKET_START.finditer(data, tk_start, tk_end)]
+    cu_start, cu_end = _xml_section(data, b"Customers")
+    try:
+        customers_el = ET.fromstring(b"<Customers>" + data[cu_start:cu_end] + b"</Customers>")
+    except ET.ParseError as e:
+        raise RuntimeError(f"Error reading XML: {e}")
+    del data
+
+    workers = workers or os.cpu_count() or 1
+    manager.clear()
+    with ProcessPoolExecutor(workers) as pool:
+        try:
+            event_chunks = _map_ranges(pool, _xml_events_range, filename,
+                                       _split_ranges(event_starts, ev_end, workers * 4))
+            ticket_chunks = _map_ranges(pool, _xml_tickets_range, filename,
+                                        _split_ranges(ticket_starts, tk_end, workers * 4))
+            for chunk in event_chunks:
+                for columns in chunk:
+                    _add_event_columns(manager, columns)
+            for c_elem in customers_el.findall("Customer"):
+                cust = customer_from_xml(c_elem)
+                manager.customers[cust.customer_id] = cust
+            for chunk in ticket_chunks:
+                for ticket in chunk:
+                    restore_ticket(manager, ticket)
+        except ET.ParseError as e:
+            raise RuntimeError(f"Error reading XML: {e}")
@@ -0,0 +1,105 @@
+# Hammers BookingManager.book_seat / cancel_ticket from a thread pool and
+# checks afterwards that no seat was sold twice.
+#
+#   python stress_booking.py --events 8 --seats 2000 --threads 16 --ops 200000
+
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from data.booking_system import BookingManager, Seat
+from data.exceptions import BookingError
+
+
+def build_manager(num_events: int, num_seats: int, num_customers: int) -> BookingManager:
+    manager = BookingManager()
+    for e in range(num_events):
+        seats = [Seat(seat_id=f"S{i}", row=f"R{i // 50}", number=i % 50 + 1, price=50.0)
+                 for i in range(num_seats)]
+        manager.add_event(f"Stress event {e}", "2025-11-15", "Arena", seats)
+    for c in range(num_customers):
+        manager.register_customer(f"Customer {c}", f"c{c}@example.com")
+    return manager
+
+
+def worker(manager: BookingManager, event_ids, seat_ids, customer_ids, ops: int, seed: int):
+    rnd = random.Random(seed)
+    own = []
+    booked = cancelled = failed = 0
+    for _ in range(ops):
+        if own and rnd.random() < 0.3:
+            tid = own.pop(rnd.randrange(len(own)))
+            try:
+                manager.cancel_ticket(tid)
+                cancelled += 1
+            except BookingError:
+                failed += 1
+        else:
+            try:
+                t = manager.book_seat(rnd.choice(event_ids), rnd.choice(seat_ids), rnd.choice(customer_ids))
+                own.append(t.ticket_id)
+                booked += 1
+            except BookingError:
+                failed += 1
+    return booked, cancelled, failed
+
+
+def verify(manager: BookingManager):
+    errors = []
+    for evt in manager.events.values():
+        holders = {}
+        for t in manager.list_tickets_for_event(evt.event_id):
+            if t.status != "booked":
+                continue
+            if t.seat_id in holders:
+                errors.append(f"seat {t.seat_id} in {evt.event_id} sold twice: {holders[t.seat_id]}, {t.ticket_id}")
+            holders[t.seat_id] = t.ticket_id
+        for s in evt.seats:
+            if s.is_reserved != (s.seat_id in holders):
+                errors.append(f"seat {s.seat_id} in {evt.event_id}: is_reserved={s.is_reserved} but tickets disagree")
+        if evt.count_available_seats() != len(evt.seats) - len(holders):
+            errors.append(f"available count of {evt.event_id} is out of sync")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent booking stress test")
+    parser.add_argument("--events", type=int, default=8)
+    parser.add_argument("--seats", type=int, default=2000)
+    parser.add_argument("--customers", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--ops", type=int, default=200000, help="total operations across all threads")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    manager = build_manager(args.events, args.seats, args.customers)
+    event_ids = list(manager.events)
+    seat_ids = [f"S{i}" for i in range(args.seats)]
+    customer_ids = list(manager.customers)
+    per_thread = args.ops // args.threads
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        futures = [pool.submit(worker, manager, event_ids, seat_ids, customer_ids, per_thread, args.seed + i)
+                   for i in range(args.threads)]
+        results = [f.result() for f in futures]
+    elapsed = time.perf_counter() - start
+
+    booked = sum(r[0] for r in results)
+    cancelled = sum(r[1] for r in results)
+    failed = sum(r[2] for r in results)
+    total = per_thread * args.threads
+    print(f"threads={args.threads} ops={total} time={elapsed:.2f}s throughput={total / elapsed:,.0f} ops/s")
+    print(f"booked={booked} cancelled={cancelled} rejected={failed}")
+
+    errors = verify(manager)
+    if errors:
+        for e in errors[:20]:
+            print("ERROR:", e)
+        raise SystemExit(f"{len(errors)} consistency errors")
+    print("OK: no seat sold twice")
+
+
+if __name__ == "__main__":
+    main()